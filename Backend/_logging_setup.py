@@ -0,0 +1,53 @@
+"""
+Shared queue-based logging setup for the standalone workflow test scripts.
+"""
+
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
+
+
+def setup_queue_logging(log_file: str, max_bytes: int = 0, buffer_capacity: int = 0) -> QueueListener:
+    """
+    Route root logging through a queue to a background listener thread.
+
+    Console and file writes happen on the listener thread, so they never block the
+    event loop. QueueHandler.prepare() still interpolates each message on the calling
+    thread (so mutable args are captured as they were at log time); only the line
+    layout and the I/O happen in the listener.
+
+    Args:
+        log_file: File that receives a copy of every record alongside stdout
+        max_bytes: Rotate the log file at this size (0 never rotates)
+        buffer_capacity: Batch file writes in a MemoryHandler of this many records,
+            flushed early on any ERROR and at exit (0 writes through)
+
+    Returns:
+        The started listener; it is stopped at interpreter exit
+    """
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    stream_handler = logging.StreamHandler(sys.stdout)
+    file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=3 if max_bytes else 0, delay=True)
+    for handler in (stream_handler, file_handler):
+        handler.setFormatter(formatter)
+
+    handlers = [stream_handler, file_handler]
+    if buffer_capacity:
+        buffered_file_handler = MemoryHandler(capacity=buffer_capacity, flushLevel=logging.ERROR, target=file_handler)
+        handlers[1] = buffered_file_handler
+
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(message)s',  # message only; the listener's handlers add the layout
+        handlers=[QueueHandler(log_queue)]
+    )
+    listener.start()
+    # atexit runs in reverse order: stop the listener first, then drain the file buffer
+    if buffer_capacity:
+        atexit.register(buffered_file_handler.flush)
+    atexit.register(listener.stop)
+    return listener
@@ -41,7 +41,8 @@ class CampaignActionAgent:
     - Make intelligent decisions about workflow routing
     """
     
-    def __init__(self, model: str = "gpt-4o-mini", temperature: float = 0.2):
+    def __init__(self, model: str = "gpt-4o-mini", temperature: float = 0.2,
+                 mcp_session: Optional[ClientSession] = None):
         self.agent_id = f"action_agent_{uuid.uuid4().hex[:8]}"
         self.model = model
         self.temperature = temperature
@@ -57,6 +58,7 @@ class CampaignActionAgent:
         # MCP connection details
         backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
         self.server_path = os.path.join(backend_dir, "mcp_server.py")
+        self.mcp_session = mcp_session  # Optional shared, already-initialized session
         self.mcp_tools = None
         self.mcp_agent = None
         
@@ -73,6 +75,13 @@ class CampaignActionAgent:
             if self.mcp_agent:
                 return True  # Already initialized
                 
+            if self.mcp_session is not None:
+                # Reuse the caller's session instead of spawning another server process
+                self.mcp_tools = await load_mcp_tools(self.mcp_session)
+                self.mcp_agent = create_react_agent(self.llm, self.mcp_tools)
+                logger.info(f"✅ {self.agent_id}: Loaded {len(self.mcp_tools)} MCP tools from shared session")
+                return True
+            
             logger.info(f"🔗 {self.agent_id}: Connecting to MCP server...")
             
             # Create server parameters
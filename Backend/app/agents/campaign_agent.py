@@ -13,6 +13,7 @@ import json
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import uuid
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -42,8 +43,14 @@ class CampaignAgent:
     def __init__(self, 
                  model: str = "gpt-4o-mini",
                  temperature: float = 0.3,
-                 max_iterations: int = 5):
-        """Initialize the Campaign Agent."""
+                 max_iterations: int = 5,
+                 mcp_session: Optional[ClientSession] = None):
+        """Initialize the Campaign Agent.
+        
+        Args:
+            mcp_session: Optional already-initialized MCP session to reuse instead
+                of spawning a server process per workflow
+        """
         self.agent_id = f"campaign_agent_{uuid.uuid4().hex[:8]}"
         self.model = model
         self.temperature = temperature
@@ -51,6 +58,7 @@ class CampaignAgent:
         
         # MCP server configuration
         self.server_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "mcp_server.py")
+        self.mcp_session = mcp_session
         
         # Initialize OpenAI client
         self.llm = ChatOpenAI(model=self.model, temperature=self.temperature)
@@ -59,6 +67,23 @@ class CampaignAgent:
         logger.info(f"🔧 Model: {self.model}, Temperature: {self.temperature}")
         logger.info(f"📍 MCP Server Path: {self.server_path}")
     
+    @asynccontextmanager
+    async def _open_mcp_session(self):
+        """Yield the shared MCP session, or a fresh one scoped to the caller."""
+        if self.mcp_session is not None:
+            yield self.mcp_session
+            return
+        
+        server_params = StdioServerParameters(
+            command="python3",
+            args=[self.server_path],
+        )
+        
+        async with stdio_client(server_params) as (read, write):
+            async with ClientSession(read, write) as mcp_session:
+                await mcp_session.initialize()
+                yield mcp_session
+    
     async def execute_campaign_workflow(self, 
                                       user_instruction: str,
                                       campaign_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -93,122 +118,113 @@ class CampaignAgent:
         }
         
         try:
-            # Create direct MCP session for this workflow
-            server_params = StdioServerParameters(
-                command="python3",
-                args=[self.server_path],
-            )
-            
-            # Use context manager for proper session handling
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as mcp_session:
-                    await mcp_session.initialize()
+            # Use the shared MCP session if one was injected, otherwise open one for this workflow
+            async with self._open_mcp_session() as mcp_session:
+                # Analyze user intent to determine which tools to use
+                intent_keywords = user_instruction.lower()
+                tool_calls_made = []
+                analysis_parts = []
+                
+                # Step 1: Get campaign data if needed
+                if any(word in intent_keywords for word in ['campaign', 'performance', 'analyze', 'optimize']):
+                    logger.info("📊 Getting campaign data...")
                     
-                    # Analyze user intent to determine which tools to use
-                    intent_keywords = user_instruction.lower()
-                    tool_calls_made = []
-                    analysis_parts = []
-                    
-                    # Step 1: Get campaign data if needed
-                    if any(word in intent_keywords for word in ['campaign', 'performance', 'analyze', 'optimize']):
-                        logger.info("📊 Getting campaign data...")
-                        
-                        # Get Facebook campaigns
-                        fb_result = await mcp_session.call_tool('mcp_get_facebook_campaigns', {'limit': 5})
-                        fb_data = fb_result.content[0].text
-                        tool_calls_made.append({
-                            "tool": "mcp_get_facebook_campaigns",
-                            "args": {"limit": 5},
-                            "result_length": len(fb_data)
-                        })
-                        analysis_parts.append(f"**Current Facebook Campaigns:**\n{fb_data[:800]}...")
-                        
-                        # Search for relevant campaigns
-                        if any(word in intent_keywords for word in ['ai', 'marketing', 'search']):
-                            search_result = await mcp_session.call_tool('mcp_search_campaign_data', {
-                                'query': 'marketing campaign performance',
-                                'limit': 3
-                            })
-                            search_data = search_result.content[0].text
-                            tool_calls_made.append({
-                                "tool": "mcp_search_campaign_data", 
-                                "args": {"query": "marketing campaign performance", "limit": 3},
-                                "result_length": len(search_data)
-                            })
-                            analysis_parts.append(f"**Campaign Search Results:**\n{search_data[:600]}...")
+                    # Get Facebook campaigns
+                    fb_result = await mcp_session.call_tool('mcp_get_facebook_campaigns', {'limit': 5})
+                    fb_data = fb_result.content[0].text
+                    tool_calls_made.append({
+                        "tool": "mcp_get_facebook_campaigns",
+                        "args": {"limit": 5},
+                        "result_length": len(fb_data)
+                    })
+                    analysis_parts.append(f"**Current Facebook Campaigns:**\n{fb_data[:800]}...")
                     
-                    # Step 2: Perform analysis if requested
-                    if any(word in intent_keywords for word in ['analyze', 'performance', 'insights']):
-                        logger.info("🔍 Performing campaign analysis...")
-                        
-                        # Use sample campaign data for analysis
-                        sample_campaign = "Campaign: Marketing Excellence, Budget: R8000, Spend: R5200, ROAS: 2.1x, CTR: 2.8%, Platform: Facebook"
-                        analysis_result = await mcp_session.call_tool('mcp_analyze_campaign_performance', {
-                            'campaign_data': sample_campaign
+                    # Search for relevant campaigns
+                    if any(word in intent_keywords for word in ['ai', 'marketing', 'search']):
+                        search_result = await mcp_session.call_tool('mcp_search_campaign_data', {
+                            'query': 'marketing campaign performance',
+                            'limit': 3
                         })
-                        analysis_data = analysis_result.content[0].text
+                        search_data = search_result.content[0].text
                         tool_calls_made.append({
-                            "tool": "mcp_analyze_campaign_performance",
-                            "args": {"campaign_data": sample_campaign},
-                            "result_length": len(analysis_data)
+                            "tool": "mcp_search_campaign_data", 
+                            "args": {"query": "marketing campaign performance", "limit": 3},
+                            "result_length": len(search_data)
                         })
-                        analysis_parts.append(f"**AI Performance Analysis:**\n{analysis_data[:1000]}...")
+                        analysis_parts.append(f"**Campaign Search Results:**\n{search_data[:600]}...")
+                
+                # Step 2: Perform analysis if requested
+                if any(word in intent_keywords for word in ['analyze', 'performance', 'insights']):
+                    logger.info("🔍 Performing campaign analysis...")
                     
-                    # Step 3: Generate optimization strategy if requested
-                    if any(word in intent_keywords for word in ['optimize', 'strategy', 'improve', 'recommendations']):
-                        logger.info("🎯 Generating optimization strategy...")
-                        
-                        strategy_result = await mcp_session.call_tool('mcp_optimize_campaign_strategy', {
-                            'campaign_data': 'Current campaign with 2.1x ROAS and 2.8% CTR',
-                            'goals': 'increase ROAS to 3.5x and improve CTR to 4.5%'
-                        })
-                        strategy_data = strategy_result.content[0].text
-                        tool_calls_made.append({
-                            "tool": "mcp_optimize_campaign_strategy",
-                            "args": {"campaign_data": "Current campaign with 2.1x ROAS and 2.8% CTR", "goals": "increase ROAS to 3.5x and improve CTR to 4.5%"},
-                            "result_length": len(strategy_data)
-                        })
-                        analysis_parts.append(f"**Optimization Strategy:**\n{strategy_data[:1000]}...")
+                    # Use sample campaign data for analysis
+                    sample_campaign = "Campaign: Marketing Excellence, Budget: R8000, Spend: R5200, ROAS: 2.1x, CTR: 2.8%, Platform: Facebook"
+                    analysis_result = await mcp_session.call_tool('mcp_analyze_campaign_performance', {
+                        'campaign_data': sample_campaign
+                    })
+                    analysis_data = analysis_result.content[0].text
+                    tool_calls_made.append({
+                        "tool": "mcp_analyze_campaign_performance",
+                        "args": {"campaign_data": sample_campaign},
+                        "result_length": len(analysis_data)
+                    })
+                    analysis_parts.append(f"**AI Performance Analysis:**\n{analysis_data[:1000]}...")
+                
+                # Step 3: Generate optimization strategy if requested
+                if any(word in intent_keywords for word in ['optimize', 'strategy', 'improve', 'recommendations']):
+                    logger.info("🎯 Generating optimization strategy...")
                     
-                    # Step 4: Generate content if requested
-                    if any(word in intent_keywords for word in ['content', 'copy', 'creative', 'generate']):
-                        logger.info("✨ Generating campaign content...")
-                        
-                        content_result = await mcp_session.call_tool('mcp_generate_campaign_content', {
-                            'campaign_type': 'ad_copy',
-                            'target_audience': 'business professionals aged 25-50',
-                            'platform': 'facebook',
-                            'campaign_objective': 'lead_generation'
-                        })
-                        content_data = content_result.content[0].text
-                        tool_calls_made.append({
-                            "tool": "mcp_generate_campaign_content",
-                            "args": {"campaign_type": "ad_copy", "target_audience": "business professionals aged 25-50", "platform": "facebook", "campaign_objective": "lead_generation"},
-                            "result_length": len(content_data)
-                        })
-                        analysis_parts.append(f"**Generated Content:**\n{content_data[:800]}...")
+                    strategy_result = await mcp_session.call_tool('mcp_optimize_campaign_strategy', {
+                        'campaign_data': 'Current campaign with 2.1x ROAS and 2.8% CTR',
+                        'goals': 'increase ROAS to 3.5x and improve CTR to 4.5%'
+                    })
+                    strategy_data = strategy_result.content[0].text
+                    tool_calls_made.append({
+                        "tool": "mcp_optimize_campaign_strategy",
+                        "args": {"campaign_data": "Current campaign with 2.1x ROAS and 2.8% CTR", "goals": "increase ROAS to 3.5x and improve CTR to 4.5%"},
+                        "result_length": len(strategy_data)
+                    })
+                    analysis_parts.append(f"**Optimization Strategy:**\n{strategy_data[:1000]}...")
+                
+                # Step 4: Generate content if requested
+                if any(word in intent_keywords for word in ['content', 'copy', 'creative', 'generate']):
+                    logger.info("✨ Generating campaign content...")
                     
-                    # Step 5: Create campaign if requested
-                    if any(word in intent_keywords for word in ['create', 'new campaign', 'launch']):
-                        logger.info("🚀 Creating new campaign...")
-                        
-                        create_result = await mcp_session.call_tool('mcp_create_campaign', {
-                            'name': f'AI Generated Campaign {datetime.now().strftime("%Y%m%d_%H%M")}',
-                            'platform': 'facebook',
-                            'objective': 'lead_generation',
-                            'budget_amount': 3000.0,
-                            'budget_type': 'daily'
-                        })
-                        create_data = create_result.content[0].text
-                        tool_calls_made.append({
-                            "tool": "mcp_create_campaign",
-                            "args": {"name": f'AI Generated Campaign {datetime.now().strftime("%Y%m%d_%H%M")}', "platform": "facebook", "objective": "lead_generation", "budget_amount": 3000.0, "budget_type": "daily"},
-                            "result_length": len(create_data)
-                        })
-                        analysis_parts.append(f"**Campaign Creation:**\n{create_data[:500]}...")
+                    content_result = await mcp_session.call_tool('mcp_generate_campaign_content', {
+                        'campaign_type': 'ad_copy',
+                        'target_audience': 'business professionals aged 25-50',
+                        'platform': 'facebook',
+                        'campaign_objective': 'lead_generation'
+                    })
+                    content_data = content_result.content[0].text
+                    tool_calls_made.append({
+                        "tool": "mcp_generate_campaign_content",
+                        "args": {"campaign_type": "ad_copy", "target_audience": "business professionals aged 25-50", "platform": "facebook", "campaign_objective": "lead_generation"},
+                        "result_length": len(content_data)
+                    })
+                    analysis_parts.append(f"**Generated Content:**\n{content_data[:800]}...")
+                
+                # Step 5: Create campaign if requested
+                if any(word in intent_keywords for word in ['create', 'new campaign', 'launch']):
+                    logger.info("🚀 Creating new campaign...")
                     
-                    # Compile final comprehensive output
-                    final_output = f"""
+                    create_result = await mcp_session.call_tool('mcp_create_campaign', {
+                        'name': f'AI Generated Campaign {datetime.now().strftime("%Y%m%d_%H%M")}',
+                        'platform': 'facebook',
+                        'objective': 'lead_generation',
+                        'budget_amount': 3000.0,
+                        'budget_type': 'daily'
+                    })
+                    create_data = create_result.content[0].text
+                    tool_calls_made.append({
+                        "tool": "mcp_create_campaign",
+                        "args": {"name": f'AI Generated Campaign {datetime.now().strftime("%Y%m%d_%H%M")}', "platform": "facebook", "objective": "lead_generation", "budget_amount": 3000.0, "budget_type": "daily"},
+                        "result_length": len(create_data)
+                    })
+                    analysis_parts.append(f"**Campaign Creation:**\n{create_data[:500]}...")
+                
+                # Compile final comprehensive output
+                final_output = f"""
 🤖 **CAMPAIGN AI DIRECT WORKFLOW RESULTS**
 📋 **Workflow ID**: {workflow_id}
 📝 **User Request**: {user_instruction}
@@ -232,21 +248,21 @@ class CampaignAgent:
 🎯 **Status**: COMPLETED
 
 🎉 **Campaign AI Direct Workflow Completed Successfully!**
-                    """
-                    
-                    results.update({
-                        "tool_calls": tool_calls_made,
-                        "final_output": final_output.strip(),
-                        "status": "completed",
-                        "completed_at": datetime.now().isoformat(),
-                        "execution_time_seconds": (datetime.now() - start_time).total_seconds()
-                    })
-                    
-                    logger.info(f"✅ Campaign workflow {workflow_id} completed successfully")
-                    logger.info(f"🛠️ Used {len(tool_calls_made)} MCP tools")
-                    
-                    return results
-                    
+                """
+                
+                results.update({
+                    "tool_calls": tool_calls_made,
+                    "final_output": final_output.strip(),
+                    "status": "completed",
+                    "completed_at": datetime.now().isoformat(),
+                    "execution_time_seconds": (datetime.now() - start_time).total_seconds()
+                })
+                
+                logger.info(f"✅ Campaign workflow {workflow_id} completed successfully")
+                logger.info(f"🛠️ Used {len(tool_calls_made)} MCP tools")
+                
+                return results
+                
         except Exception as e:
             logger.error(f"❌ Campaign workflow {workflow_id} failed: {str(e)}")
             results.update({
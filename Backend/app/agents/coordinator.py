@@ -42,7 +42,8 @@ class CoordinatorAgent:
     the overall workflow execution with proper validation and error handling.
     """
     
-    def __init__(self, model: str = "gpt-4o-mini", temperature: float = 0.1):
+    def __init__(self, model: str = "gpt-4o-mini", temperature: float = 0.1,
+                 mcp_session: Optional[ClientSession] = None):
         self.coordinator_id = f"coordinator_{uuid.uuid4().hex[:8]}"
         self.model = model
         self.temperature = temperature
@@ -57,6 +58,7 @@ class CoordinatorAgent:
         
         # MCP connection details
         self.server_path = os.path.join(backend_dir, "mcp_server.py")
+        self.mcp_session = mcp_session  # Optional shared, already-initialized session
         self.mcp_tools = None
         self.mcp_agent = None
         
@@ -76,6 +78,13 @@ class CoordinatorAgent:
             if self.mcp_agent:
                 return True  # Already initialized
                 
+            if self.mcp_session is not None:
+                # Reuse the caller's session instead of spawning another server process
+                self.mcp_tools = await load_mcp_tools(self.mcp_session)
+                self.mcp_agent = create_react_agent(self.llm, self.mcp_tools)
+                logger.info(f"✅ {self.coordinator_id}: Loaded {len(self.mcp_tools)} MCP tools from shared session")
+                return True
+            
             logger.info(f"🔗 {self.coordinator_id}: Initializing MCP connection...")
             
             # Create server parameters
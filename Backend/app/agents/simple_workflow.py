@@ -10,7 +10,7 @@ import sys
 import asyncio
 import logging
 import json
-from typing import Dict, Any, List, Optional, TypedDict
+from typing import Dict, Any, List, Optional, Tuple, TypedDict
 from datetime import datetime
 import uuid
 from dotenv import load_dotenv
@@ -33,6 +33,12 @@ from mcp.client.session import ClientSession
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of MCP tool calls dispatched concurrently by a single agent
+MAX_PARALLEL_TOOL_CALLS = int(os.getenv("TOOL_CONCURRENCY_LIMIT", 8))
+
+# Seconds before a single dispatched tool call is abandoned so it cannot stall its batch
+TOOL_CALL_TIMEOUT = float(os.getenv("TOOL_CALL_TIMEOUT", 60))
+
 class SimpleWorkflowState(TypedDict):
     """Simple state for the multi-agent workflow."""
     workflow_id: str
@@ -59,7 +65,8 @@ class SimpleWorkflowState(TypedDict):
 class SimpleAgent:
     """Base class for simple agents that use direct MCP calls."""
     
-    def __init__(self, agent_type: str, model: str = "gpt-4o-mini", temperature: float = 0.3):
+    def __init__(self, agent_type: str, model: str = "gpt-4o-mini", temperature: float = 0.3,
+                 mcp_session: Optional[ClientSession] = None):
         self.agent_id = f"{agent_type}_{uuid.uuid4().hex[:8]}"
         self.agent_type = agent_type
         self.model = model
@@ -67,6 +74,7 @@ class SimpleAgent:
         
         # MCP server path
         self.mcp_server_path = os.path.join(backend_dir, "mcp_server.py")
+        self.mcp_session = mcp_session  # Optional shared, already-initialized session
         
         # Initialize OpenAI client
         self.llm = ChatOpenAI(model=self.model, temperature=self.temperature)
@@ -76,6 +84,10 @@ class SimpleAgent:
     async def call_mcp_tool(self, tool_name: str, args: Dict[str, Any]) -> str:
         """Make a direct MCP tool call."""
         try:
+            if self.mcp_session is not None:
+                result = await self.mcp_session.call_tool(tool_name, args)
+                return result.content[0].text
+            
             server_params = StdioServerParameters(
                 command="python3",
                 args=[self.mcp_server_path],
@@ -92,6 +104,40 @@ class SimpleAgent:
             logger.error(f"❌ {self.agent_id}: MCP tool call failed: {str(e)}")
             return f"Error calling {tool_name}: {str(e)}"
     
+    async def _invoke_tool(self, tool_call: Tuple[str, Dict[str, Any]], semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """Run a single MCP tool call under the dispatch semaphore."""
+        tool_name, args = tool_call
+        async with semaphore:
+            result = await asyncio.wait_for(self.call_mcp_tool(tool_name, args), timeout=TOOL_CALL_TIMEOUT)
+        return {
+            "tool": tool_name,
+            "args": args,
+            "result": result,
+            "completed_at": datetime.now().isoformat()
+        }
+    
+    async def _dispatch_tools(self, pending: List[Tuple[str, Dict[str, Any]]],
+                              max_parallel: int = MAX_PARALLEL_TOOL_CALLS) -> List[Dict[str, Any]]:
+        """Run independent MCP tool calls concurrently.
+        
+        Results are returned in the same order as ``pending``. A call that raises
+        or exceeds TOOL_CALL_TIMEOUT is reported with its exception in ``error``
+        instead of aborting the batch.
+        """
+        semaphore = asyncio.Semaphore(max_parallel)
+        tasks = [asyncio.create_task(self._invoke_tool(tc, semaphore)) for tc in pending]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        outcomes = []
+        for (tool_name, args), result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Tool call {tool_name} failed: {result!r}")
+                outcomes.append({"tool": tool_name, "args": args, "result": "", "error": repr(result),
+                                 "completed_at": datetime.now().isoformat()})
+            else:
+                outcomes.append(result)
+        return outcomes
+    
     async def think_and_act(self, prompt: str, context: Dict[str, Any] = None) -> str:
         """Use OpenAI to think and then act with MCP tools."""
         try:
@@ -106,8 +152,8 @@ class SimpleAgent:
 class IntentAnalysisAgent(SimpleAgent):
     """Agent that analyzes user intent."""
     
-    def __init__(self):
-        super().__init__("intent_analyzer", temperature=0.1)
+    def __init__(self, mcp_session: Optional[ClientSession] = None):
+        super().__init__("intent_analyzer", temperature=0.1, mcp_session=mcp_session)
     
     async def analyze_intent(self, user_instruction: str) -> Dict[str, Any]:
         """Analyze user intent with enhanced brainstorming detection."""
@@ -205,8 +251,8 @@ class IntentAnalysisAgent(SimpleAgent):
 class DataCollectionAgent(SimpleAgent):
     """Agent that collects campaign data."""
     
-    def __init__(self):
-        super().__init__("data_collector", temperature=0.2)
+    def __init__(self, mcp_session: Optional[ClientSession] = None):
+        super().__init__("data_collector", temperature=0.2, mcp_session=mcp_session)
     
     async def collect_campaign_data(self, intent: Dict[str, Any]) -> Dict[str, Any]:
         """Collect campaign data using MCP tools."""
@@ -249,8 +295,8 @@ class DataCollectionAgent(SimpleAgent):
 class PerformanceAnalysisAgent(SimpleAgent):
     """Agent that analyzes campaign performance."""
     
-    def __init__(self):
-        super().__init__("performance_analyzer", temperature=0.3)
+    def __init__(self, mcp_session: Optional[ClientSession] = None):
+        super().__init__("performance_analyzer", temperature=0.3, mcp_session=mcp_session)
     
     async def analyze_performance(self, campaign_data: Dict[str, Any], intent: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze campaign performance with focus on specific campaigns and actionable insights."""
@@ -310,8 +356,8 @@ class PerformanceAnalysisAgent(SimpleAgent):
 class StrategyOptimizationAgent(SimpleAgent):
     """Agent that develops optimization strategies."""
     
-    def __init__(self):
-        super().__init__("strategy_optimizer", temperature=0.4)
+    def __init__(self, mcp_session: Optional[ClientSession] = None):
+        super().__init__("strategy_optimizer", temperature=0.4, mcp_session=mcp_session)
     
     async def develop_strategy(self, analysis: Dict[str, Any], intent: Dict[str, Any]) -> Dict[str, Any]:
         """Develop targeted optimization strategy with enhanced web research for brainstorming."""
@@ -326,6 +372,7 @@ class StrategyOptimizationAgent(SimpleAgent):
             # Enhanced web research for brainstorming scenarios
             research_insights = ""
             web_search_count = 0
+            research_tool_calls = []
             
             if intent_type == "BRAINSTORMING" or intent.get("requires_web_research", False):
                 logger.info("🌐 BRAINSTORMING DETECTED: Triggering comprehensive web research...")
@@ -353,26 +400,27 @@ class StrategyOptimizationAgent(SimpleAgent):
                         "CTR optimization best practices 2024"
                     ])
                 
-                # Perform multiple web searches
-                for query in search_queries[:4]:  # Limit to 4 searches for performance
-                    try:
-                        logger.info(f"🔍 Searching: {query}")
-                        search_result = await self.call_mcp_tool("mcp_tavily_search", {"query": query})
-                        if search_result and len(search_result) > 100:
-                            research_insights += f"\n\n**🌐 Market Research: {query}**\n{search_result[:600]}...\n"
-                            web_search_count += 1
-                    except Exception as e:
-                        logger.warning(f"Search failed for '{query}': {e}")
+                # Dispatch all web searches (plus Wikipedia context) as a single batch
+                batch = [("mcp_tavily_search", {"query": query}) for query in search_queries[:4]]  # Limit to 4 searches for performance
+                batch.append(("mcp_wikipedia_search", {"query": "Digital marketing trends"}))
+                logger.info(f"🔍 Dispatching {len(batch)} research queries in parallel")
                 
-                # Also try Wikipedia for broader context
-                try:
-                    logger.info("📚 Searching Wikipedia for additional context...")
-                    wiki_result = await self.call_mcp_tool("mcp_wikipedia_search", {"query": "Digital marketing trends"})
-                    if wiki_result and len(wiki_result) > 100:
-                        research_insights += f"\n\n**📚 Wikipedia Context: Digital Marketing Trends**\n{wiki_result[:400]}...\n"
-                        web_search_count += 1
-                except Exception as e:
-                    logger.warning(f"Wikipedia search failed: {e}")
+                for outcome in await self._dispatch_tools(batch):
+                    query = outcome["args"]["query"]
+                    search_result = outcome["result"]
+                    if not search_result or len(search_result) <= 100:
+                        continue
+                    if outcome["tool"] == "mcp_wikipedia_search":
+                        research_insights += f"\n\n**📚 Wikipedia Context: Digital Marketing Trends**\n{search_result[:400]}...\n"
+                    else:
+                        research_insights += f"\n\n**🌐 Market Research: {query}**\n{search_result[:600]}...\n"
+                    web_search_count += 1
+                    research_tool_calls.append({
+                        "tool": outcome["tool"],
+                        "status": "success",
+                        "query": query,
+                        "completed_at": outcome["completed_at"]
+                    })
             
             # Use MCP tool for initial strategy optimization
             strategy_result = await self.call_mcp_tool('mcp_optimize_campaign_strategy', {
@@ -455,14 +503,19 @@ class StrategyOptimizationAgent(SimpleAgent):
                     additional_queries.append("Facebook ads performance improvement strategies")
                 
                 # Perform targeted web searches
-                for query in additional_queries[:2]:  # Limit searches
-                    try:
-                        search_result = await self.call_mcp_tool("mcp_tavily_search", {"query": query})
-                        if search_result and len(search_result) > 100:
-                            research_insights += f"\n\n**Research: {query}**\n{search_result[:400]}..."
-                            web_search_count += 1
-                    except Exception as e:
-                        logger.warning(f"Research search failed for '{query}': {e}")
+                batch = [("mcp_tavily_search", {"query": query}) for query in additional_queries[:2]]  # Limit searches
+                for outcome in await self._dispatch_tools(batch):
+                    query = outcome["args"]["query"]
+                    search_result = outcome["result"]
+                    if search_result and len(search_result) > 100:
+                        research_insights += f"\n\n**Research: {query}**\n{search_result[:400]}..."
+                        web_search_count += 1
+                        research_tool_calls.append({
+                            "tool": outcome["tool"],
+                            "status": "success",
+                            "query": query,
+                            "completed_at": outcome["completed_at"]
+                        })
             
             strategy_data = {
                 "mcp_strategy": strategy_result,
@@ -474,7 +527,7 @@ class StrategyOptimizationAgent(SimpleAgent):
                 "timestamp": datetime.now().isoformat(),
                 "tool_calls": [
                     {"tool": "mcp_optimize_campaign_strategy", "status": "success"},
-                    *[{"tool": "mcp_tavily_search", "status": "success"} for _ in range(web_search_count)]
+                    *research_tool_calls
                 ]
             }
             
@@ -488,8 +541,8 @@ class StrategyOptimizationAgent(SimpleAgent):
 class ContentGenerationAgent(SimpleAgent):
     """Agent that generates campaign content."""
     
-    def __init__(self):
-        super().__init__("content_generator", temperature=0.6)
+    def __init__(self, mcp_session: Optional[ClientSession] = None):
+        super().__init__("content_generator", temperature=0.6, mcp_session=mcp_session)
     
     async def generate_content(self, strategy: Dict[str, Any], intent: Dict[str, Any]) -> Dict[str, Any]:
         """Generate campaign content using MCP tools."""
@@ -535,15 +588,15 @@ class ContentGenerationAgent(SimpleAgent):
 class SimpleMultiAgentWorkflow:
     """Simple multi-agent workflow using LangGraph."""
     
-    def __init__(self):
+    def __init__(self, mcp_session: Optional[ClientSession] = None):
         self.workflow_id = f"simple_workflow_{uuid.uuid4().hex[:8]}"
         
-        # Initialize agents
-        self.intent_agent = IntentAnalysisAgent()
-        self.data_agent = DataCollectionAgent()
-        self.analysis_agent = PerformanceAnalysisAgent()
-        self.strategy_agent = StrategyOptimizationAgent()
-        self.content_agent = ContentGenerationAgent()
+        # Initialize agents (optionally sharing one MCP session)
+        self.intent_agent = IntentAnalysisAgent(mcp_session)
+        self.data_agent = DataCollectionAgent(mcp_session)
+        self.analysis_agent = PerformanceAnalysisAgent(mcp_session)
+        self.strategy_agent = StrategyOptimizationAgent(mcp_session)
+        self.content_agent = ContentGenerationAgent(mcp_session)
         
         # Build the graph
         self.graph = self._build_graph()
@@ -889,18 +942,18 @@ class SimpleMultiAgentWorkflow:
                 
                 # Perform web searches
                 web_insights = []
-                for query in search_queries[:2]:  # Limit to 2 searches to avoid delays
-                    try:
-                        search_result = await self.data_agent.call_mcp_tool("mcp_tavily_search", {"query": query})
-                        if search_result and len(search_result) > 100:
-                            web_insights.append(f"**Market Research - {query}**: {search_result[:500]}...")
-                            state["tool_calls"].append({
-                                "tool": "mcp_tavily_search",
-                                "status": "success",
-                                "query": query
-                            })
-                    except Exception as e:
-                        logger.warning(f"Web search failed for '{query}': {e}")
+                batch = [("mcp_tavily_search", {"query": query}) for query in search_queries[:2]]  # Limit to 2 searches to avoid delays
+                for outcome in await self.data_agent._dispatch_tools(batch):
+                    query = outcome["args"]["query"]
+                    search_result = outcome["result"]
+                    if search_result and len(search_result) > 100:
+                        web_insights.append(f"**Market Research - {query}**: {search_result[:500]}...")
+                        state["tool_calls"].append({
+                            "tool": "mcp_tavily_search",
+                            "status": "success",
+                            "query": query,
+                            "completed_at": outcome["completed_at"]
+                        })
                 
                 if web_insights:
                     additional_insights = f"\n\n## Latest Industry Insights\n" + "\n\n".join(web_insights)
@@ -1209,6 +1262,28 @@ class SimpleMultiAgentWorkflow:
             initial_state["completed_at"] = datetime.now().isoformat()
             return initial_state
     
+    async def warmup(self) -> None:
+        """Pay one-time connection costs before a timed run.
+        
+        Issues a tiny request through each agent's LLM client so the HTTPS/TLS
+        handshakes are done, and touches the shared MCP session if one is set.
+        The graph itself is already compiled in __init__.
+        """
+        logger.info(f"🔥 Warming up workflow: {self.workflow_id}")
+        agents = [self.intent_agent, self.data_agent, self.analysis_agent,
+                  self.strategy_agent, self.content_agent]
+        
+        calls = [agent.llm.ainvoke([HumanMessage(content="ping")]) for agent in agents]
+        if self.data_agent.mcp_session is not None:
+            calls.append(self.data_agent.mcp_session.list_tools())
+        
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        failures = [r for r in results if isinstance(r, Exception)]
+        if failures:
+            logger.warning(f"⚠️ Warmup finished with {len(failures)} failed call(s): {failures[0]}")
+        else:
+            logger.info("✅ Warmup completed")
+    
     def visualize_graph(self, output_path: str = "simple_workflow_graph.png"):
         """Generate a visual representation of the workflow graph."""
         try:
@@ -142,44 +142,10 @@ class EnforcerAgent:
                 self.retry_counts.pop(f"{workflow_id}_{operation}", None)
                 logger.info(f"🔄 Reset counters for workflow: {workflow_id}")
             
-            # Track iterations
-            if workflow_id not in self.iteration_counts:
-                self.iteration_counts[workflow_id] = 0
-            self.iteration_counts[workflow_id] += 1
+            result = self._tick(workflow_id, operation, f"{workflow_id}_{operation}")
             
-            # Track retries for specific operations
-            retry_key = f"{workflow_id}_{operation}"
-            if retry_key not in self.retry_counts:
-                self.retry_counts[retry_key] = 0
-            self.retry_counts[retry_key] += 1
-            
-            current_iterations = self.iteration_counts[workflow_id]
-            current_retries = self.retry_counts[retry_key]
-            
-            # Check limits
-            if current_iterations > self.max_iterations:
-                reason = f"Maximum iterations exceeded ({current_iterations}/{self.max_iterations})"
-                should_continue = False
-            elif current_retries > self.max_retries:
-                reason = f"Maximum retries exceeded for {operation} ({current_retries}/{self.max_retries})"
-                should_continue = False
-            else:
-                reason = f"Within limits (iterations: {current_iterations}/{self.max_iterations}, retries: {current_retries}/{self.max_retries})"
-                should_continue = True
-            
-            result = {
-                'should_continue': should_continue,
-                'reason': reason,
-                'counts': {
-                    'iterations': current_iterations,
-                    'retries': current_retries,
-                    'max_iterations': self.max_iterations,
-                    'max_retries': self.max_retries
-                }
-            }
-            
-            status = "CONTINUE" if should_continue else "STOP"
-            logger.info(f"🛡️ Enforcer Decision: {status} - {reason}")
+            status = "CONTINUE" if result['should_continue'] else "STOP"
+            logger.info(f"🛡️ Enforcer Decision: {status} - {result['reason']}")
             return result
             
         except Exception as e:
@@ -190,6 +156,73 @@ class EnforcerAgent:
                 'counts': {}
             }
     
+    def should_continue_batch(self,
+                              workflow_id: str,
+                              operation: str = "default",
+                              count: int = 1) -> List[Dict[str, Any]]:
+        """
+        Make ``count`` consecutive should_continue decisions in one call.
+        
+        Equivalent to calling should_continue ``count`` times, but the counter
+        keys are resolved once and a single summary line is logged.
+        
+        Args:
+            workflow_id: Unique identifier for the workflow session
+            operation: Specific operation being tracked
+            count: Number of decisions to make
+            
+        Returns:
+            List of decision dicts in the same format as should_continue
+        """
+        try:
+            retry_key = f"{workflow_id}_{operation}"
+            decisions = [self._tick(workflow_id, operation, retry_key) for _ in range(count)]
+            
+            stops = sum(1 for d in decisions if not d['should_continue'])
+            logger.info(f"🛡️ Enforcer Batch: {count - stops} CONTINUE, {stops} STOP for {workflow_id}/{operation}")
+            return decisions
+            
+        except Exception as e:
+            logger.error(f"❌ Enforcer error: {str(e)}")
+            # Still one decision per requested count, all defaulting to stop
+            return [{
+                'should_continue': False,
+                'reason': f"Enforcer error: {str(e)}",
+                'counts': {}
+            } for _ in range(count)]
+    
+    def _tick(self, workflow_id: str, operation: str, retry_key: str) -> Dict[str, Any]:
+        """Advance the counters for one decision and evaluate the limits."""
+        # Track iterations
+        current_iterations = self.iteration_counts.get(workflow_id, 0) + 1
+        self.iteration_counts[workflow_id] = current_iterations
+        
+        # Track retries for specific operations
+        current_retries = self.retry_counts.get(retry_key, 0) + 1
+        self.retry_counts[retry_key] = current_retries
+        
+        # Check limits
+        if current_iterations > self.max_iterations:
+            reason = f"Maximum iterations exceeded ({current_iterations}/{self.max_iterations})"
+            should_continue = False
+        elif current_retries > self.max_retries:
+            reason = f"Maximum retries exceeded for {operation} ({current_retries}/{self.max_retries})"
+            should_continue = False
+        else:
+            reason = f"Within limits (iterations: {current_iterations}/{self.max_iterations}, retries: {current_retries}/{self.max_retries})"
+            should_continue = True
+        
+        return {
+            'should_continue': should_continue,
+            'reason': reason,
+            'counts': {
+                'iterations': current_iterations,
+                'retries': current_retries,
+                'max_iterations': self.max_iterations,
+                'max_retries': self.max_retries
+            }
+        }
+    
     def get_status(self, workflow_id: str) -> Dict[str, Any]:
         """Get current status for a workflow."""
         return {
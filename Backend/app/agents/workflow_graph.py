@@ -75,7 +75,8 @@ class WorkflowState(TypedDict):
 class SimpleAgent:
     """Simple agent that uses direct MCP calls."""
     
-    def __init__(self, agent_type: str, model: str = "gpt-4o-mini", temperature: float = 0.3):
+    def __init__(self, agent_type: str, model: str = "gpt-4o-mini", temperature: float = 0.3,
+                 mcp_session: Optional[ClientSession] = None):
         self.agent_id = f"{agent_type}_{uuid.uuid4().hex[:8]}"
         self.agent_type = agent_type
         self.model = model
@@ -83,6 +84,7 @@ class SimpleAgent:
         
         # MCP server path
         self.mcp_server_path = os.path.join(backend_dir, "mcp_server.py")
+        self.mcp_session = mcp_session  # Optional shared, already-initialized session
         
         # Initialize OpenAI client
         self.llm = ChatOpenAI(model=self.model, temperature=self.temperature)
@@ -92,6 +94,10 @@ class SimpleAgent:
     async def call_mcp_tool(self, tool_name: str, args: Dict[str, Any]) -> str:
         """Make a direct MCP tool call."""
         try:
+            if self.mcp_session is not None:
+                result = await self.mcp_session.call_tool(tool_name, args)
+                return result.content[0].text
+            
             server_params = StdioServerParameters(
                 command="python3",
                 args=[self.mcp_server_path],
@@ -111,7 +117,7 @@ class SimpleAgent:
     async def think_and_act(self, prompt: str) -> str:
         """Use OpenAI to think and analyze."""
         try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
+            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
             return response.content
             
         except Exception as e:
@@ -125,18 +131,19 @@ class CampaignOptimizationGraph:
     This workflow uses direct MCP calls without complex agent dependencies.
     """
     
-    def __init__(self, model: str = "gpt-4o-mini", temperature: float = 0.3):
+    def __init__(self, model: str = "gpt-4o-mini", temperature: float = 0.3,
+                 mcp_session: Optional[ClientSession] = None):
         self.workflow_id = f"workflow_{uuid.uuid4().hex[:8]}"
         self.model = model
         self.temperature = temperature
         self.mcp_server_path = os.path.join(backend_dir, "mcp_server.py")
         
         # Initialize simple agents
-        self.intent_agent = SimpleAgent("intent_analyzer", model, 0.1)
-        self.data_agent = SimpleAgent("data_collector", model, 0.2)
-        self.analysis_agent = SimpleAgent("performance_analyzer", model, 0.3)
-        self.strategy_agent = SimpleAgent("strategy_optimizer", model, 0.4)
-        self.content_agent = SimpleAgent("content_generator", model, 0.6)
+        self.intent_agent = SimpleAgent("intent_analyzer", model, 0.1, mcp_session)
+        self.data_agent = SimpleAgent("data_collector", model, 0.2, mcp_session)
+        self.analysis_agent = SimpleAgent("performance_analyzer", model, 0.3, mcp_session)
+        self.strategy_agent = SimpleAgent("strategy_optimizer", model, 0.4, mcp_session)
+        self.content_agent = SimpleAgent("content_generator", model, 0.6, mcp_session)
         
         # Build the graph
         self.graph = self._build_graph()
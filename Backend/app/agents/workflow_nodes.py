@@ -37,7 +37,8 @@ logger = logging.getLogger(__name__)
 class BaseWorkflowNode:
     """Base class for workflow nodes that use MCP protocol."""
     
-    def __init__(self, node_type: str, model: str = "gpt-4o-mini", temperature: float = 0.3):
+    def __init__(self, node_type: str, model: str = "gpt-4o-mini", temperature: float = 0.3,
+                 mcp_session: Optional[ClientSession] = None):
         self.node_id = f"{node_type}_{uuid.uuid4().hex[:8]}"
         self.node_type = node_type
         self.model = model
@@ -53,6 +54,7 @@ class BaseWorkflowNode:
         
         # MCP connection details
         self.server_path = os.path.join(backend_dir, "mcp_server.py")
+        self.mcp_session = mcp_session  # Optional shared, already-initialized session
         self.mcp_tools = None
         self.mcp_agent = None
         
@@ -68,6 +70,13 @@ class BaseWorkflowNode:
             if self.mcp_agent:
                 return True  # Already initialized
                 
+            if self.mcp_session is not None:
+                # Reuse the caller's session instead of spawning another server process
+                self.mcp_tools = await load_mcp_tools(self.mcp_session)
+                self.mcp_agent = create_react_agent(self.llm, self.mcp_tools)
+                logger.info(f"✅ {self.node_id}: Loaded {len(self.mcp_tools)} MCP tools from shared session")
+                return True
+            
             logger.info(f"🔗 {self.node_id}: Initializing MCP connection...")
             
             # Create server parameters
@@ -189,8 +198,8 @@ class BaseWorkflowNode:
 class CampaignMonitorNode(BaseWorkflowNode):
     """Node for monitoring campaign performance and detecting anomalies."""
     
-    def __init__(self):
-        super().__init__("monitor", temperature=0.2)
+    def __init__(self, mcp_session: Optional[ClientSession] = None):
+        super().__init__("monitor", temperature=0.2, mcp_session=mcp_session)
     
     async def execute(self, state: CampaignOptimizationState) -> CampaignOptimizationState:
         """Execute campaign monitoring using MCP tools."""
@@ -277,8 +286,8 @@ Execute the monitoring using the available MCP tools and provide structured anal
 class DataAnalysisNode(BaseWorkflowNode):
     """Node for performing data analysis and trend detection."""
     
-    def __init__(self):
-        super().__init__("analysis", temperature=0.3)
+    def __init__(self, mcp_session: Optional[ClientSession] = None):
+        super().__init__("analysis", temperature=0.3, mcp_session=mcp_session)
     
     async def execute(self, state: CampaignOptimizationState) -> CampaignOptimizationState:
         """Perform data analysis using MCP tools."""
@@ -339,8 +348,8 @@ Use vector search and analysis tools to identify patterns and insights."""
 class OptimizationNode(BaseWorkflowNode):
     """Node for generating optimization recommendations."""
     
-    def __init__(self):
-        super().__init__("optimization", temperature=0.4)
+    def __init__(self, mcp_session: Optional[ClientSession] = None):
+        super().__init__("optimization", temperature=0.4, mcp_session=mcp_session)
     
     async def execute(self, state: CampaignOptimizationState) -> CampaignOptimizationState:
         """Generate optimization recommendations using MCP tools."""
@@ -401,8 +410,8 @@ Use LLM tools to generate actionable optimization strategies."""
 class ReportingNode(BaseWorkflowNode):
     """Node for generating comprehensive reports."""
     
-    def __init__(self):
-        super().__init__("reporting", temperature=0.2)
+    def __init__(self, mcp_session: Optional[ClientSession] = None):
+        super().__init__("reporting", temperature=0.2, mcp_session=mcp_session)
     
     async def execute(self, state: CampaignOptimizationState) -> CampaignOptimizationState:
         """Generate comprehensive reports using MCP tools."""
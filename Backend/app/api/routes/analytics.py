@@ -9,12 +9,15 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func, desc
 from pydantic import BaseModel, Field
 
-from ...core.database import get_session
+from ...core.cache import overview_cache
+from ...core.database import get_async_session
 from ...models.campaign import Campaign, PlatformType, CampaignStatus
 from ...models.campaign_metrics import CampaignMetrics
 from ...services.facebook_api_sim import facebook_api_sim
@@ -25,6 +28,9 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
+# Rows fetched per round-trip when streaming large result sets
+STREAM_CHUNK_SIZE = 500
+
 # Pydantic models
 class PerformanceMetrics(BaseModel):
     """Performance metrics response"""
@@ -77,13 +83,24 @@ class AnalyticsOverview(BaseModel):
     top_performers: List[TopPerformer]
     generated_at: datetime
 
-@router.get("/overview", response_model=AnalyticsOverview)
+@router.get("/overview", response_model=None, responses={200: {"model": AnalyticsOverview}})
 async def get_analytics_overview(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
     platform: Optional[PlatformType] = Query(None, description="Filter by platform"),
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
-    """Get comprehensive analytics overview"""
+    """
+    Get comprehensive analytics overview
+    
+    The serialized payload is cached per (platform, days) for OVERVIEW_CACHE_TTL
+    seconds and cleared on campaign writes, so a cache hit returns the bytes of an
+    earlier request, including its generated_at.
+    """
+    
+    cache_key = (platform, days)
+    cached = overview_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
     
     start_date = datetime.utcnow().date() - timedelta(days=days)
     
@@ -92,9 +109,9 @@ async def get_analytics_overview(
     if platform:
         query = query.where(Campaign.platform == platform)
     
-    # Get campaigns
-    result = await session.execute(query)
-    campaigns = result.scalars().all()
+    # Get campaigns, fetched in chunks (the aggregations below need them all in memory)
+    result = await session.stream_scalars(query.execution_options(yield_per=STREAM_CHUNK_SIZE))
+    campaigns = [campaign async for campaign in result]
     
     # Calculate performance metrics
     total_campaigns = len(campaigns)
@@ -103,13 +120,14 @@ async def get_analytics_overview(
     total_impressions = sum(c.impressions or 0 for c in campaigns)
     total_clicks = sum(c.clicks or 0 for c in campaigns)
     total_conversions = sum(c.conversions or 0 for c in campaigns)
-    total_spend = sum(float(c.daily_spend or 0) for c in campaigns) * days
+    total_spend = float(sum(float(c.daily_spend or 0) for c in campaigns) * days)
     
-    avg_ctr = (total_clicks / total_impressions) if total_impressions > 0 else 0
-    avg_cpc = (total_spend / total_clicks) if total_clicks > 0 else 0
-    avg_roas = sum(float(c.roas or 0) for c in campaigns) / len(campaigns) if campaigns else 0
+    # Float fallbacks: model_construct below doesn't coerce to the declared types
+    avg_ctr = (total_clicks / total_impressions) if total_impressions > 0 else 0.0
+    avg_cpc = (total_spend / total_clicks) if total_clicks > 0 else 0.0
+    avg_roas = sum(float(c.roas or 0) for c in campaigns) / len(campaigns) if campaigns else 0.0
     
-    performance_metrics = PerformanceMetrics(
+    performance_metrics = PerformanceMetrics.model_construct(
         total_campaigns=total_campaigns,
         active_campaigns=active_campaigns,
         total_impressions=total_impressions,
@@ -143,14 +161,14 @@ async def get_analytics_overview(
     
     platform_comparison = []
     for platform_name, stats in platform_stats.items():
-        ctr = (stats['clicks'] / stats['impressions']) if stats['impressions'] > 0 else 0
-        cpc = (stats['spend'] / stats['clicks']) if stats['clicks'] > 0 else 0
+        ctr = (stats['clicks'] / stats['impressions']) if stats['impressions'] > 0 else 0.0
+        cpc = (stats['spend'] / stats['clicks']) if stats['clicks'] > 0 else 0.0
         
         # Calculate ROAS for platform
         platform_campaigns = [c for c in campaigns if c.platform == platform_name]
-        platform_roas = sum(float(c.roas or 0) for c in platform_campaigns) / len(platform_campaigns) if platform_campaigns else 0
+        platform_roas = sum(float(c.roas or 0) for c in platform_campaigns) / len(platform_campaigns) if platform_campaigns else 0.0
         
-        platform_comparison.append(PlatformComparison(
+        platform_comparison.append(PlatformComparison.model_construct(
             platform=platform_name,
             campaigns=stats['campaigns'],
             impressions=stats['impressions'],
@@ -174,7 +192,7 @@ async def get_analytics_overview(
         daily_conversions = int(daily_clicks * 0.1)  # 10% conversion rate
         daily_spend = total_spend / days
         
-        trends.append(TrendData(
+        trends.append(TrendData.model_construct(
             date=trend_date.isoformat(),
             impressions=daily_impressions,
             clicks=daily_clicks,
@@ -192,8 +210,8 @@ async def get_analytics_overview(
     top_roas_campaigns = sorted(campaigns, key=lambda x: x.roas or 0, reverse=True)[:3]
     for campaign in top_roas_campaigns:
         if campaign.roas:
-            top_performers.append(TopPerformer(
-                campaign_id=campaign.id,
+            top_performers.append(TopPerformer.model_construct(
+                campaign_id=str(campaign.id),
                 campaign_name=campaign.name,
                 platform=campaign.platform,
                 metric_value=float(campaign.roas),
@@ -204,27 +222,33 @@ async def get_analytics_overview(
     top_ctr_campaigns = sorted(campaigns, key=lambda x: x.ctr or 0, reverse=True)[:3]
     for campaign in top_ctr_campaigns:
         if campaign.ctr:
-            top_performers.append(TopPerformer(
-                campaign_id=campaign.id,
+            top_performers.append(TopPerformer.model_construct(
+                campaign_id=str(campaign.id),
                 campaign_name=campaign.name,
                 platform=campaign.platform,
                 metric_value=float(campaign.ctr),
                 metric_name="CTR"
             ))
     
-    return AnalyticsOverview(
+    overview = AnalyticsOverview.model_construct(
         performance_metrics=performance_metrics,
         platform_comparison=platform_comparison,
         trends=list(reversed(trends)),  # Most recent first
         top_performers=top_performers,
         generated_at=datetime.utcnow()
     )
+    
+    # Every field above is computed server-side, so the models skip validation
+    # (model_construct) and are serialized once with orjson; the bytes are cached
+    payload = orjson.dumps(overview.model_dump())
+    overview_cache[cache_key] = payload
+    return Response(content=payload, media_type="application/json")
 
 @router.get("/performance")
 async def get_performance_insights(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
     platform: Optional[PlatformType] = Query(None, description="Filter by platform"),
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get detailed performance insights"""
     
@@ -254,7 +278,7 @@ async def get_performance_insights(
     
     if not campaigns:
         insights["key_insights"].append("No campaigns found for the specified criteria")
-        return insights
+        return ORJSONResponse(insights)
     
     # Calculate benchmarks
     avg_roas = sum(float(c.roas or 0) for c in campaigns) / len(campaigns)
@@ -334,14 +358,14 @@ async def get_performance_insights(
     
     insights["generated_at"] = datetime.utcnow().isoformat()
     
-    return insights
+    return ORJSONResponse(insights)
 
 @router.get("/trends/{metric}")
 async def get_metric_trends(
     metric: str = Query(..., regex="^(impressions|clicks|conversions|spend|ctr|cpc|roas)$"),
     days: int = Query(30, ge=7, le=90, description="Number of days to analyze"),
     platform: Optional[PlatformType] = Query(None, description="Filter by platform"),
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get trends for a specific metric"""
     
@@ -385,7 +409,7 @@ async def get_metric_trends(
         trend_direction = "stable"
         trend_strength = 0
     
-    return {
+    return ORJSONResponse({
         "metric": metric,
         "analysis_period": f"{days} days",
         "platform_filter": platform.value if platform else "all",
@@ -399,12 +423,12 @@ async def get_metric_trends(
             "latest_value": trends[-1]["value"] if trends else 0
         },
         "generated_at": datetime.utcnow().isoformat()
-    }
+    })
 
 @router.get("/comparison")
 async def get_platform_comparison(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Compare performance across platforms"""
     
@@ -480,7 +504,7 @@ async def get_platform_comparison(
     # Determine best performing platform
     best_platform = max(comparison.values(), key=lambda x: x["efficiency_score"]) if comparison else None
     
-    return {
+    return ORJSONResponse({
         "analysis_period": f"{days} days",
         "platforms": list(comparison.values()),
         "best_performing_platform": best_platform["platform"] if best_platform else None,
@@ -489,14 +513,14 @@ async def get_platform_comparison(
             f"Best performing platform: {best_platform['platform']}" if best_platform else "No data available"
         ],
         "generated_at": datetime.utcnow().isoformat()
-    }
+    })
 
 @router.get("/demographics")
 async def get_demographic_insights(
     campaign_id: Optional[str] = Query(None, description="Specific campaign ID"),
     platform: Optional[PlatformType] = Query(None, description="Filter by platform"),
     days: int = Query(30, ge=1, le=90, description="Number of days to analyze"),
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get demographic performance insights"""
     
@@ -556,7 +580,7 @@ async def get_demographic_insights(
     best_age_group = max(demographic_data["age_performance"].items(), 
                         key=lambda x: x[1]["conversion_rate"])[0] if demographic_data["age_performance"] else None
     
-    return {
+    return ORJSONResponse({
         "analysis_period": f"{days} days",
         "campaigns_analyzed": len(campaigns),
         "platform_filter": platform.value if platform else "all",
@@ -569,4 +593,4 @@ async def get_demographic_insights(
             f"Consider increasing budget allocation to {best_age_group} age group" if best_age_group else "More data needed for recommendations"
         ],
         "generated_at": datetime.utcnow().isoformat()
-    } 
\ No newline at end of file
+    })
\ No newline at end of file
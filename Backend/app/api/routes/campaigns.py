@@ -9,17 +9,19 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc
-from pydantic import BaseModel, Field
+from sqlalchemy import select, and_, desc, insert
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
 
-from ...core.database import get_session
+from ...core.cache import invalidate_campaign_caches
+from ...core.database import get_async_session
 from ...models.campaign import Campaign, CampaignStatus, PlatformType
 from ...models.campaign_metrics import CampaignMetrics
 from ...agents.workflow_graph import create_campaign_graph
-from ...agents.coordinator import coordinator
 from ...agents.state import Priority, WorkflowStatus
 
 logger = logging.getLogger(__name__)
@@ -27,6 +29,9 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter(prefix="/campaigns", tags=["campaigns"])
 
+# Rows fetched per round-trip when streaming list results
+STREAM_CHUNK_SIZE = 500
+
 # Pydantic models for request/response
 class CampaignCreate(BaseModel):
     """Campaign creation request"""
@@ -48,23 +53,25 @@ class CampaignUpdate(BaseModel):
     ad_creative: Optional[Dict[str, Any]] = None
 
 class CampaignResponse(BaseModel):
-    """Campaign response model"""
-    id: str
+    """Campaign response model (read straight from Campaign rows)"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
     name: str
     platform: PlatformType
     status: CampaignStatus
     budget: Optional[float]
-    daily_spend: Optional[float]
+    spend: Optional[float]
     impressions: Optional[int]
     clicks: Optional[int]
     conversions: Optional[int]
     ctr: Optional[float]
     cpc: Optional[float]
     roas: Optional[float]
-    start_date: datetime
+    start_date: Optional[datetime]
     end_date: Optional[datetime]
-    created_at: datetime
-    updated_at: datetime
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
 
 class CampaignMetricsResponse(BaseModel):
     """Campaign metrics response"""
@@ -84,10 +91,15 @@ class CampaignMetricsResponse(BaseModel):
 class OptimizationRequest(BaseModel):
     """Optimization request"""
     campaign_ids: List[str]
-    optimization_type: str = Field(default="all", regex="^(budget|targeting|creative|all)$")
+    optimization_type: str = Field(default="all", pattern="^(budget|targeting|creative|all)$")
     priority: Priority = Priority.MEDIUM
     constraints: Optional[Dict[str, Any]] = None
 
+# Validators for the hand-parsed request bodies, built once at import
+_campaign_create_adapter = TypeAdapter(CampaignCreate)
+_campaign_create_list_adapter = TypeAdapter(List[CampaignCreate])
+_optimization_request_adapter = TypeAdapter(OptimizationRequest)
+
 class WorkflowResponse(BaseModel):
     """Workflow response"""
     workflow_id: str
@@ -105,7 +117,7 @@ async def list_campaigns(
     status: Optional[CampaignStatus] = Query(None, description="Filter by status"),
     limit: int = Query(50, ge=1, le=1000, description="Number of campaigns to return"),
     offset: int = Query(0, ge=0, description="Number of campaigns to skip"),
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """List campaigns with optional filtering"""
     
@@ -118,15 +130,19 @@ async def list_campaigns(
     
     query = query.offset(offset).limit(limit).order_by(desc(Campaign.created_at))
     
-    result = await session.execute(query)
-    campaigns = result.scalars().all()
+    # Stream rows in chunks rather than buffering the whole result set
+    campaigns = await session.stream_scalars(query.execution_options(yield_per=STREAM_CHUNK_SIZE))
     
-    return [CampaignResponse.from_orm(campaign) for campaign in campaigns]
+    # Serialize straight with orjson instead of jsonable_encoder
+    return ORJSONResponse(
+        [CampaignResponse.from_orm(campaign).model_dump() async for campaign in campaigns],
+        status_code=200
+    )
 
 @router.get("/{campaign_id}", response_model=CampaignResponse)
 async def get_campaign(
     campaign_id: str,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get a specific campaign by ID"""
     
@@ -137,13 +153,49 @@ async def get_campaign(
     
     return CampaignResponse.from_orm(campaign)
 
-@router.post("/", response_model=CampaignResponse)
+def get_workflow_graph():
+    """Workflow graph dependency (overridden with a stub in the API tests)"""
+    return create_campaign_graph()
+
+async def _parse_json_body(request: Request, adapter: TypeAdapter):
+    """
+    Decode the request body with orjson and validate it with a prebuilt adapter.
+    
+    Failures raise RequestValidationError, so the 422 body is FastAPI's usual
+    list of {loc, msg, type} errors with locations under "body".
+    """
+    try:
+        payload = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise RequestValidationError([{
+            "type": "json_invalid",
+            "loc": ("body", e.pos),
+            "msg": "JSON decode error",
+            "input": {},
+            "ctx": {"error": e.msg}
+        }])
+    
+    try:
+        return adapter.validate_python(payload)
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])}
+            for error in e.errors(include_url=False)
+        ])
+
+@router.post(
+    "/",
+    response_model=CampaignResponse,
+    openapi_extra={"requestBody": {"content": {"application/json": {"schema": CampaignCreate.model_json_schema()}}, "required": True}}
+)
 async def create_campaign(
-    campaign_data: CampaignCreate,
-    session: AsyncSession = Depends(get_session)
+    request: Request,
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Create a new campaign"""
     
+    campaign_data = await _parse_json_body(request, _campaign_create_adapter)
+    
     campaign = Campaign(
         name=campaign_data.name,
         platform=campaign_data.platform,
@@ -157,17 +209,64 @@ async def create_campaign(
     
     session.add(campaign)
     await session.commit()
+    invalidate_campaign_caches()
     await session.refresh(campaign)
     
     logger.info(f"Created campaign {campaign.id}: {campaign.name}")
     
     return CampaignResponse.from_orm(campaign)
 
+@router.post(
+    "/bulk",
+    response_model=None,
+    responses={200: {"model": List[CampaignResponse]}},
+    openapi_extra={"requestBody": {"content": {"application/json": {"schema": {"type": "array", "items": CampaignCreate.model_json_schema()}}}, "required": True}}
+)
+async def create_campaigns_bulk(
+    request: Request,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Create several campaigns with a single multi-row INSERT"""
+    
+    campaigns_data = await _parse_json_body(request, _campaign_create_list_adapter)
+    
+    if not campaigns_data:
+        return ORJSONResponse([])
+    
+    rows = [
+        {
+            "name": campaign_data.name,
+            "platform": campaign_data.platform,
+            "budget": campaign_data.budget,
+            "start_date": campaign_data.start_date,
+            "end_date": campaign_data.end_date,
+            "target_audience": campaign_data.targeting,
+            "ad_creative": campaign_data.ad_creative,
+            "status": CampaignStatus.ACTIVE
+        }
+        for campaign_data in campaigns_data
+    ]
+    
+    # Multi-row RETURNING order isn't guaranteed; keep results aligned with the request
+    result = await session.scalars(insert(Campaign).returning(Campaign, sort_by_parameter_order=True), rows)
+    # Build the response before committing so a serialization error can't leave
+    # committed rows behind a 500
+    payload = [
+        CampaignResponse.model_validate(campaign).model_dump(mode="json")
+        for campaign in result.all()
+    ]
+    await session.commit()
+    invalidate_campaign_caches()
+    
+    logger.info(f"Created {len(payload)} campaigns in bulk")
+    
+    return ORJSONResponse(payload)
+
 @router.put("/{campaign_id}", response_model=CampaignResponse)
 async def update_campaign(
     campaign_id: str,
     campaign_data: CampaignUpdate,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Update an existing campaign"""
     
@@ -185,6 +284,7 @@ async def update_campaign(
     campaign.updated_at = datetime.utcnow()
     
     await session.commit()
+    invalidate_campaign_caches()
     await session.refresh(campaign)
     
     logger.info(f"Updated campaign {campaign_id}")
@@ -194,7 +294,7 @@ async def update_campaign(
 @router.delete("/{campaign_id}")
 async def delete_campaign(
     campaign_id: str,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Delete a campaign"""
     
@@ -205,16 +305,17 @@ async def delete_campaign(
     
     await session.delete(campaign)
     await session.commit()
+    invalidate_campaign_caches()
     
     logger.info(f"Deleted campaign {campaign_id}")
     
     return {"message": f"Campaign {campaign_id} deleted successfully"}
 
-@router.get("/{campaign_id}/metrics", response_model=List[CampaignMetricsResponse])
+@router.get("/{campaign_id}/metrics", response_model=None, responses={200: {"model": List[CampaignMetricsResponse]}})
 async def get_campaign_metrics(
     campaign_id: str,
     days: int = Query(7, ge=1, le=90, description="Number of days of metrics to retrieve"),
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get campaign metrics for a specified time range"""
     
@@ -236,7 +337,8 @@ async def get_campaign_metrics(
     result = await session.execute(query)
     metrics = result.scalars().all()
     
-    return [
+    # Models are validated on construction; skip FastAPI's second encode/validate pass
+    return ORJSONResponse([
         CampaignMetricsResponse(
             campaign_id=m.campaign_id,
             date=m.date.isoformat(),
@@ -250,9 +352,9 @@ async def get_campaign_metrics(
             age_demographics=m.age_demographics,
             gender_demographics=m.gender_demographics,
             location_demographics=m.location_demographics
-        )
+        ).model_dump(mode="json")
         for m in metrics
-    ]
+    ])
 
 @router.post("/{campaign_id}/optimize", response_model=WorkflowResponse)
 async def optimize_campaign(
@@ -260,7 +362,8 @@ async def optimize_campaign(
     optimization_type: str = Query("all", regex="^(budget|targeting|creative|all)$"),
     priority: Priority = Query(Priority.MEDIUM),
     background_tasks: BackgroundTasks = BackgroundTasks(),
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session),
+    workflow_graph = Depends(get_workflow_graph)
 ):
     """Start campaign optimization workflow"""
     
@@ -271,7 +374,7 @@ async def optimize_campaign(
     
     # Start optimization workflow
     try:
-        result = await create_campaign_graph().run_workflow(
+        result = await workflow_graph.run_workflow(
             campaign_id=campaign_id,
             trigger_reason="api_optimization_request",
             priority=priority
@@ -294,14 +397,22 @@ async def optimize_campaign(
         logger.error(f"Failed to start optimization for campaign {campaign_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to start optimization: {str(e)}")
 
-@router.post("/optimize/batch", response_model=List[WorkflowResponse])
+@router.post(
+    "/optimize/batch",
+    response_model=None,
+    responses={200: {"model": List[WorkflowResponse]}},
+    openapi_extra={"requestBody": {"content": {"application/json": {"schema": OptimizationRequest.model_json_schema()}}, "required": True}}
+)
 async def optimize_campaigns_batch(
-    request: OptimizationRequest,
+    raw_request: Request,
     background_tasks: BackgroundTasks = BackgroundTasks(),
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session),
+    workflow_graph = Depends(get_workflow_graph)
 ):
     """Optimize multiple campaigns in batch"""
     
+    request = await _parse_json_body(raw_request, _optimization_request_adapter)
+    
     workflows = []
     
     for campaign_id in request.campaign_ids:
@@ -312,7 +423,7 @@ async def optimize_campaigns_batch(
             continue
         
         try:
-            result = await create_campaign_graph().run_workflow(
+            result = await workflow_graph.run_workflow(
                 campaign_id=campaign_id,
                 trigger_reason="api_batch_optimization",
                 priority=request.priority
@@ -344,17 +455,18 @@ async def optimize_campaigns_batch(
     
     logger.info(f"Started batch optimization for {len(workflows)} campaigns")
     
-    return workflows
+    return ORJSONResponse([workflow.model_dump(mode="json") for workflow in workflows])
 
 @router.get("/{campaign_id}/workflow/{workflow_id}", response_model=WorkflowResponse)
 async def get_workflow_status(
     campaign_id: str,
-    workflow_id: str
+    workflow_id: str,
+    workflow_graph = Depends(get_workflow_graph)
 ):
     """Get workflow execution status"""
     
     try:
-        state = await create_campaign_graph().get_workflow_state(workflow_id)
+        state = await workflow_graph.get_workflow_state(workflow_id)
         
         if not state:
             raise HTTPException(status_code=404, detail=f"Workflow {workflow_id} not found")
@@ -377,7 +489,7 @@ async def get_workflow_status(
 @router.get("/{campaign_id}/performance")
 async def get_campaign_performance(
     campaign_id: str,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get campaign performance summary"""
     
@@ -0,0 +1,16 @@
+from cachetools import TTLCache
+
+# Seconds an analytics overview payload is served from memory
+OVERVIEW_CACHE_TTL = 60
+
+# Serialized /analytics/overview payloads keyed on (platform, days)
+overview_cache: TTLCache = TTLCache(maxsize=8, ttl=OVERVIEW_CACHE_TTL)
+
+
+def invalidate_campaign_caches() -> None:
+    """
+    Drop cached payloads derived from campaign rows.
+    
+    Call after any committed campaign write (create, bulk create, update, delete).
+    """
+    overview_cache.clear()
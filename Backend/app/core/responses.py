@@ -0,0 +1,20 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class PydanticResponse(JSONResponse):
+    """
+    Response that serializes a Pydantic model with its native JSON encoder.
+    
+    Skips jsonable_encoder entirely; None fields are kept so the payload matches
+    the declared model. The body is rendered in the constructor, so callers catch
+    serialization errors where the response is built. Plain dicts/lists fall back
+    to the regular JSONResponse rendering.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json(by_alias=True).encode("utf-8")
+        return super().render(content)
@@ -19,7 +19,9 @@ import uuid
 backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(backend_dir)
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import orjson
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
@@ -32,6 +34,8 @@ from app.agents import (
     create_campaign_graph
 )
 
+from app.core.responses import PydanticResponse
+
 # Import direct database access
 from app.services.supabase_service import supabase_service
 from app.tools.campaign_action_tool import list_campaigns_by_criteria
@@ -44,7 +48,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Campaign AI Application",
     description="MCP-integrated campaign optimization platform with direct data access",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -449,9 +454,16 @@ async def health_check():
             "error": str(e)
         }
 
+# Serialized /tools payload; the MCP tool set is fixed once the connection is up
+_tools_payload: Optional[bytes] = None
+
 @app.get("/tools")
 async def list_available_tools():
     """List all available MCP tools."""
+    global _tools_payload
+    if _tools_payload is not None:
+        return Response(content=_tools_payload, media_type="application/json")
+    
     try:
         if not campaign_agent or not campaign_agent.mcp_tools:
             await campaign_agent.initialize_mcp_connection()
@@ -464,7 +476,7 @@ async def list_available_tools():
                 "parameters": tool.args_schema.schema() if hasattr(tool, 'args_schema') else {}
             })
         
-        return {
+        _tools_payload = orjson.dumps({
             "total_tools": len(tools_info),
             "tools": tools_info,
             "categories": {
@@ -473,7 +485,8 @@ async def list_available_tools():
                 "search_tools": [t for t in tools_info if "search" in t["name"] or "tavily" in t["name"] or "wikipedia" in t["name"]],
                 "validation_tools": [t for t in tools_info if "grade" in t["name"] or "enforce" in t["name"]]
             }
-        }
+        })
+        return Response(content=_tools_payload, media_type="application/json")
         
     except Exception as e:
         logger.error(f"❌ Failed to list tools: {str(e)}")
@@ -491,7 +504,7 @@ class MCPToolResponse(BaseModel):
     workflowId: Optional[str] = None
     langsmithTrace: Optional[str] = None
 
-@app.post("/api/mcp", response_model=MCPToolResponse)
+@app.post("/api/mcp", response_model=None, responses={200: {"model": MCPToolResponse}})
 async def call_mcp_tool(request: MCPToolRequest):
     """
     Call MCP tools directly - this endpoint matches what the frontend expects.
@@ -514,11 +527,11 @@ async def call_mcp_tool(request: MCPToolRequest):
                 break
         
         if not tool_to_call:
-            return MCPToolResponse(
+            return PydanticResponse(MCPToolResponse.model_construct(
                 success=False,
                 data=None,
                 error=f"Tool '{request.tool}' not found. Available tools: {[t.name for t in campaign_agent.mcp_tools]}"
-            )
+            ))
         
         # Call the tool
         result = await tool_to_call.ainvoke(request.params)
@@ -528,20 +541,23 @@ async def call_mcp_tool(request: MCPToolRequest):
         
         logger.info(f"✅ MCP Tool '{request.tool}' executed successfully")
         
-        return MCPToolResponse(
+        # The tool result is serialized here, inside the try: a result that isn't
+        # JSON-serializable becomes the error response below instead of a 500
+        response = PydanticResponse(MCPToolResponse.model_construct(
             success=True,
             data=result,
             workflowId=workflow_id,
             langsmithTrace=f"https://smith.langchain.com/trace/{workflow_id}"
-        )
+        ))
+        return response
         
     except Exception as e:
         logger.error(f"❌ MCP Tool call failed: {str(e)}")
-        return MCPToolResponse(
+        return PydanticResponse(MCPToolResponse.model_construct(
             success=False,
             data=None,
             error=str(e)
-        )
+        ))
 
 if __name__ == "__main__":
     import uvicorn
@@ -41,7 +41,14 @@ celery_app.conf.update(
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
     worker_prefetch_multiplier=1,
+    task_acks_late=True,  # ack after completion so a reserved task never blocks a free worker slot
     worker_max_tasks_per_child=1000,
+    # Long-running optimizations get their own queue so they cannot starve short tasks.
+    # Workers must consume both queues, e.g. `celery -A app.workers.background_tasks worker -Q celery,optimize`
+    task_routes={
+        'app.workers.background_tasks.trigger_campaign_optimization': {'queue': 'optimize'},
+        'app.workers.background_tasks.run_scheduled_optimizations': {'queue': 'optimize'},
+    },
 )
 
 # Beat schedule for periodic tasks
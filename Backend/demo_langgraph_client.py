@@ -11,12 +11,13 @@ This client demonstrates the enhanced multi-agent Campaign AI system by:
 """
 
 import asyncio
-import json
 import os
 import sys
 import logging
 from datetime import datetime
 from typing import Dict, Any, List
+
+import orjson
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -223,16 +224,17 @@ class CampaignAIDemoClient:
             filename = f"campaign_ai_demo_results_{timestamp}.json"
         
         try:
-            with open(filename, 'w') as f:
-                json.dump({
-                    "demo_metadata": {
-                        "timestamp": datetime.now().isoformat(),
-                        "total_scenarios": len(results),
-                        "langsmith_project": os.environ.get('LANGCHAIN_PROJECT'),
-                        "langsmith_tracing": os.environ.get('LANGCHAIN_TRACING_V2')
-                    },
-                    "results": results
-                }, f, indent=2, default=str)
+            payload = {
+                "demo_metadata": {
+                    "timestamp": datetime.now().isoformat(),
+                    "total_scenarios": len(results),
+                    "langsmith_project": os.environ.get('LANGCHAIN_PROJECT'),
+                    "langsmith_tracing": os.environ.get('LANGCHAIN_TRACING_V2')
+                },
+                "results": results
+            }
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2, default=str))
             
             logger.info(f"💾 Results saved to: {filename}")
             
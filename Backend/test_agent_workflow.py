@@ -6,12 +6,20 @@ Test Full Agent Workflow with MCP Tools
 import asyncio
 import sys
 import os
-from app.agents.campaign_agent import CampaignAgent
+from _logging_setup import setup_queue_logging
+from tests._llm_cache import cached_run, cache_summary
+
+# Agent/MCP log records go through a queue to a background listener thread, so
+# console and file writes never block the event loop while the workflow runs.
+log_listener = setup_queue_logging('agent_workflow_test.log')
 
 async def test_agent_workflow():
     try:
         print('🤖 Testing full agent workflow with MCP tools...')
         
+        # Imported here so the LangChain/OpenAI import cost is only paid when the test runs
+        from app.agents.campaign_agent import CampaignAgent
+        
         # Create campaign agent
         agent = CampaignAgent(model="gpt-4o-mini", temperature=0.3)
         print(f'✅ Created agent: {agent.agent_id}')
@@ -26,9 +34,14 @@ async def test_agent_workflow():
         
         # Test workflow execution
         print('\n🧪 Testing workflow: "Show me the best performing campaigns"')
-        result = await agent.execute_campaign_workflow(
-            user_instruction="Show me the best performing campaigns with highest ROAS",
-            campaign_context={"focus": "performance_analysis"}
+        instruction = "Show me the best performing campaigns with highest ROAS"
+        context = {"focus": "performance_analysis"}
+        result = await cached_run(
+            lambda: agent.execute_campaign_workflow(
+                user_instruction=instruction,
+                campaign_context=context
+            ),
+            {'cls': type(agent).__name__, 'instr': instruction.lower().strip(), 'ctx': context}
         )
         
         print(f'\n📊 Workflow Results:')
@@ -55,6 +68,8 @@ async def test_agent_workflow():
         print(f'❌ Agent workflow test failed: {str(e)}')
         import traceback
         traceback.print_exc()
+    finally:
+        print(cache_summary())
 
 if __name__ == "__main__":
     asyncio.run(test_agent_workflow()) 
\ No newline at end of file
@@ -15,10 +15,12 @@ that we haven't considered based on our previous campaigns?"
 """
 
 import asyncio
+import hashlib
 import logging
+import re
 import sys
 import os
-from datetime import datetime
+import time
 
 # Add Backend to path
 sys.path.append(os.getcwd())
@@ -26,151 +28,218 @@ sys.path.append(os.getcwd())
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Keywords checked in the final report, matched in a single scan
+_VALIDATION_RE = re.compile(r"market|trend|2024|idea|strategy|innovative|campaign|facebook|instagram", re.IGNORECASE)
+
+class OutputBuffer:
+    """Collects report lines and writes them to stdout in one call per section."""
+    
+    def __init__(self):
+        self.buf = []
+    
+    def p(self, *args):
+        self.buf.append(" ".join(map(str, args)))
+    
+    def flush(self):
+        if self.buf:
+            sys.stdout.write("\n".join(self.buf) + "\n")
+            sys.stdout.flush()
+            self.buf.clear()
+
+# Tool families, checked in order against the lowercased tool name
+_TOOL_KINDS = (
+    ("tavily", ("tavily",)),
+    ("wikipedia", ("wikipedia",)),
+    ("facebook_instagram", ("facebook", "instagram")),
+    ("analyze", ("analyze",)),
+    ("optimize", ("optimize",)),
+    ("generate", ("generate",))
+)
+
+_EMOJI = {
+    "tavily": "🌐",
+    "wikipedia": "📚",
+    "facebook_instagram": "📱",
+    "analyze": "🔍",
+    "optimize": "🎯",
+    "generate": "✨",
+    "other": "🛠️"
+}
+
+def _classify(name_lc: str) -> str:
+    """Map a lowercased tool name to its tool family."""
+    return next((kind for kind, needles in _TOOL_KINDS if any(n in name_lc for n in needles)), "other")
+
+# One line of the execution-sequence listing: index, emoji, tool name, status, query info
+_SEQUENCE_LINE = "   %2d. %s %-35s → %s%s"
+
+def graph_signature(workflow) -> str:
+    """Short hash of the compiled graph's nodes and edges, used to cache the rendered PNG."""
+    graph = workflow.graph.get_graph()
+    nodes = sorted(graph.nodes)
+    edges = sorted((edge.source, edge.target) for edge in graph.edges)
+    return hashlib.sha1(repr(nodes).encode() + repr(edges).encode()).hexdigest()[:12]
+
 async def test_web_search_workflow():
     """Test the workflow's web search integration for campaign brainstorming."""
     
+    out = OutputBuffer()
+    
     try:
         from app.agents.simple_workflow import SimpleMultiAgentWorkflow
         
-        print('🌐 WEB SEARCH INTEGRATION TEST')
-        print('=' * 80)
-        print('Testing: Automatic Web Research for Fresh Campaign Ideas')
-        print('Expected: Multiple web searches, market insights, innovative recommendations')
-        print('=' * 80)
-        print()
+        out.p('🌐 WEB SEARCH INTEGRATION TEST')
+        out.p('=' * 80)
+        out.p('Testing: Automatic Web Research for Fresh Campaign Ideas')
+        out.p('Expected: Multiple web searches, market insights, innovative recommendations')
+        out.p('=' * 80)
+        out.p()
         
         # Create workflow
         workflow = SimpleMultiAgentWorkflow()
         
         # Generate graph visualization
-        print('📊 Generating workflow graph visualization...')
-        graph_path = workflow.visualize_graph("web_search_workflow_graph.png")
-        if graph_path:
-            print(f'✅ Graph saved as: {graph_path}')
-        print()
+        out.p('📊 Generating workflow graph visualization...')
+        out.flush()
+        graph_path = f"web_search_workflow_graph.{graph_signature(workflow)}.png"
+        render_task = None
+        if os.path.exists(graph_path):
+            out.p(f'✅ Graph unchanged, reusing: {graph_path}')
+        else:
+            # Rendering is slow and blocking: run it in a thread alongside the workflow
+            render_task = asyncio.create_task(asyncio.to_thread(workflow.visualize_graph, graph_path))
+            out.p('⏳ Rendering graph in the background...')
+        out.p()
         
         # Campaign brainstorming question that should trigger extensive web research
         brainstorming_question = """I'm thinking about improving some of my low-performing campaigns and I need fresh ideas of what's out there in the market. Can you help me brainstorm some fresh ideas that we haven't considered based on our previous campaigns? I want to know about the latest trends, innovative strategies, and what successful brands are doing differently in 2024."""
         
-        print('❓ BRAINSTORMING QUESTION:')
-        print('-' * 60)
-        print(brainstorming_question)
-        print('-' * 60)
-        print()
-        print('⏳ Running workflow with web research focus...')
-        print('🌐 Expected: Multiple web searches for trends, strategies, and innovations')
-        print()
+        out.p('❓ BRAINSTORMING QUESTION:')
+        out.p('-' * 60)
+        out.p(brainstorming_question)
+        out.p('-' * 60)
+        out.p()
+        out.p('⏳ Running workflow with web research focus...')
+        out.p('🌐 Expected: Multiple web searches for trends, strategies, and innovations')
+        out.p()
+        out.flush()
         
-        start_time = datetime.now()
-        result = await workflow.run_workflow(brainstorming_question)
-        execution_time = (datetime.now() - start_time).total_seconds()
+        result = None
+        try:
+            # Warm up LLM clients so the timing reflects steady-state cost (CAMPAIGNAI_WARMUP=0 for cold start)
+            if os.getenv("CAMPAIGNAI_WARMUP", "1") == "1":
+                await workflow.warmup()
+            
+            start_time = time.perf_counter()
+            result = await workflow.run_workflow(brainstorming_question)
+            execution_time = time.perf_counter() - start_time
+        finally:
+            # Don't leave the background render orphaned if the workflow raised
+            if render_task is not None and result is None:
+                render_task.cancel()
+                await asyncio.gather(render_task, return_exceptions=True)
+        if render_task is not None:
+            graph_path = await render_task
+            if graph_path:
+                out.p(f'✅ Graph saved as: {graph_path}')
+                out.p()
+        tool_calls = result.get("tool_calls") or []
+        workflow_status = result["status"]
         
         # Analyze web search usage
-        print('🌐 WEB SEARCH ANALYSIS')
-        print('=' * 60)
-        print(f'✅ Status: {result["status"]}')
-        print(f'⏱️  Execution Time: {execution_time:.2f} seconds')
-        print(f'🛠️  Total Tool Calls: {len(result.get("tool_calls", []))}')
-        print()
+        out.p('🌐 WEB SEARCH ANALYSIS')
+        out.p('=' * 60)
+        out.p(f'✅ Status: {workflow_status}')
+        out.p(f'⏱️  Execution Time: {execution_time:.2f} seconds')
+        out.p(f'🛠️  Total Tool Calls: {len(tool_calls)}')
+        out.p()
         
-        # Count web search tools used
-        web_searches = [tool for tool in result.get("tool_calls", []) if "tavily" in tool.get("tool", "").lower()]
-        wikipedia_searches = [tool for tool in result.get("tool_calls", []) if "wikipedia" in tool.get("tool", "").lower()]
+        # Index tool calls by family once; later sections read from this
+        tools_by_kind = {kind: [] for kind in _EMOJI}
+        for tc in tool_calls:
+            kind = _classify(tc.get("tool", "").lower())
+            tc["_kind"] = kind
+            tc["_emoji"] = _EMOJI[kind]
+            tools_by_kind[kind].append(tc)
+        web_searches = tools_by_kind["tavily"]
+        wikipedia_searches = tools_by_kind["wikipedia"]
         
-        print('🔍 WEB RESEARCH BREAKDOWN:')
-        print('-' * 40)
-        print(f'   🌐 Tavily Web Searches: {len(web_searches)}')
-        print(f'   📚 Wikipedia Searches: {len(wikipedia_searches)}')
-        print(f'   📊 Campaign Data Tools: {len(result.get("tool_calls", [])) - len(web_searches) - len(wikipedia_searches)}')
-        print()
+        out.p('🔍 WEB RESEARCH BREAKDOWN:')
+        out.p('-' * 40)
+        out.p(f'   🌐 Tavily Web Searches: {len(web_searches)}')
+        out.p(f'   📚 Wikipedia Searches: {len(wikipedia_searches)}')
+        out.p(f'   📊 Campaign Data Tools: {len(tool_calls) - len(web_searches) - len(wikipedia_searches)}')
+        out.p()
         
-        # Show specific web searches performed
+        # Show specific web searches performed (dispatched in parallel, so list by completion time)
         if web_searches or wikipedia_searches:
-            print('🔍 SPECIFIC WEB SEARCHES PERFORMED:')
-            print('-' * 50)
-            search_count = 1
-            for search in web_searches:
+            out.p('🔍 SPECIFIC WEB SEARCHES PERFORMED:')
+            out.p('-' * 50)
+            searches = sorted(web_searches + wikipedia_searches, key=lambda s: s.get("completed_at", ""))
+            for search_count, search in enumerate(searches, 1):
+                source = "Wikipedia" if search["_kind"] == "wikipedia" else "Tavily"
                 query = search.get("query", "Unknown query")
                 status = search.get("status", "Unknown")
-                print(f'   {search_count:2d}. Tavily: "{query}" → {status}')
-                search_count += 1
-            
-            for search in wikipedia_searches:
-                query = search.get("query", "Unknown query")
-                status = search.get("status", "Unknown")
-                print(f'   {search_count:2d}. Wikipedia: "{query}" → {status}')
-                search_count += 1
-            print()
+                out.p(f'   {search_count:2d}. {source}: "{query}" → {status}')
+            out.p()
         
         # Show all tool calls in order
-        if result.get("tool_calls"):
-            print('🔧 COMPLETE TOOL EXECUTION SEQUENCE:')
-            print('-' * 45)
-            for i, tool_call in enumerate(result["tool_calls"], 1):
+        if tool_calls:
+            out.p('🔧 COMPLETE TOOL EXECUTION SEQUENCE:')
+            out.p('-' * 45)
+            for i, tool_call in enumerate(tool_calls, 1):
                 tool_name = tool_call.get("tool", "Unknown")
                 status = tool_call.get("status", "Unknown")
                 query = tool_call.get("query", "")
-                
-                # Add emoji based on tool type
-                if "tavily" in tool_name.lower():
-                    emoji = "🌐"
-                elif "wikipedia" in tool_name.lower():
-                    emoji = "📚"
-                elif "facebook" in tool_name.lower() or "instagram" in tool_name.lower():
-                    emoji = "📱"
-                elif "analyze" in tool_name.lower():
-                    emoji = "🔍"
-                elif "optimize" in tool_name.lower():
-                    emoji = "🎯"
-                elif "generate" in tool_name.lower():
-                    emoji = "✨"
-                else:
-                    emoji = "🛠️"
+                emoji = tool_call["_emoji"]
                 
                 query_info = f' ("{query[:40]}...")' if query and len(query) > 5 else ""
-                print(f'   {i:2d}. {emoji} {tool_name:<35} → {status}{query_info}')
-            print()
+                out.p(_SEQUENCE_LINE % (i, emoji, tool_name, status, query_info))
+            out.p()
         
-        if result['status'] == 'completed':
-            print('📋 FRESH IDEAS & MARKET INSIGHTS REPORT:')
-            print('=' * 80)
+        if workflow_status == 'completed':
+            out.p('📋 FRESH IDEAS & MARKET INSIGHTS REPORT:')
+            out.p('=' * 80)
             
             final_output = result['final_output']
-            print(final_output)
+            out.p(final_output)
             
-            print('=' * 80)
-            print()
+            out.p('=' * 80)
+            out.p()
             
             # Validate web search integration
-            print('🔍 WEB SEARCH INTEGRATION VALIDATION:')
-            print('-' * 50)
+            out.p('🔍 WEB SEARCH INTEGRATION VALIDATION:')
+            out.p('-' * 50)
             
             # Check if web searches were triggered
             web_search_triggered = len(web_searches) > 0
-            print(f'   ✅ Web Search Triggered: {"Yes" if web_search_triggered else "No"} ({len(web_searches)} searches)')
+            out.p(f'   ✅ Web Search Triggered: {"Yes" if web_search_triggered else "No"} ({len(web_searches)} searches)')
             
             # Check if multiple search queries were used
             multiple_searches = len(web_searches) >= 2
-            print(f'   ✅ Multiple Search Queries: {"Yes" if multiple_searches else "No"} ({len(web_searches)} queries)')
+            out.p(f'   ✅ Multiple Search Queries: {"Yes" if multiple_searches else "No"} ({len(web_searches)} queries)')
+            
+            # Collect every validation keyword present in the report in one pass
+            hits = {m.group().lower() for m in _VALIDATION_RE.finditer(final_output)}
             
             # Check if market insights are included
-            has_market_insights = "market" in final_output.lower() or "trend" in final_output.lower() or "2024" in final_output
-            print(f'   ✅ Market Insights Included: {"Yes" if has_market_insights else "No"}')
+            has_market_insights = bool(hits & {"market", "trend", "2024"})
+            out.p(f'   ✅ Market Insights Included: {"Yes" if has_market_insights else "No"}')
             
             # Check if fresh ideas are provided
-            has_fresh_ideas = "idea" in final_output.lower() or "strategy" in final_output.lower() or "innovative" in final_output.lower()
-            print(f'   ✅ Fresh Ideas Generated: {"Yes" if has_fresh_ideas else "No"}')
+            has_fresh_ideas = bool(hits & {"idea", "strategy", "innovative"})
+            out.p(f'   ✅ Fresh Ideas Generated: {"Yes" if has_fresh_ideas else "No"}')
             
             # Check if research is integrated with campaign data
-            has_campaign_integration = "campaign" in final_output.lower() and ("facebook" in final_output.lower() or "instagram" in final_output.lower())
-            print(f'   ✅ Campaign Data Integration: {"Yes" if has_campaign_integration else "No"}')
+            has_campaign_integration = "campaign" in hits and bool(hits & {"facebook", "instagram"})
+            out.p(f'   ✅ Campaign Data Integration: {"Yes" if has_campaign_integration else "No"}')
             
             # Check response comprehensiveness
             response_length = len(final_output)
             is_comprehensive = response_length > 2000  # Should be detailed with web research
-            print(f'   ✅ Comprehensive Response: {"Yes" if is_comprehensive else "No"} ({response_length} chars)')
+            out.p(f'   ✅ Comprehensive Response: {"Yes" if is_comprehensive else "No"} ({response_length} chars)')
             
-            print()
+            out.p()
             
             # Overall web search assessment
             web_search_score = sum([
@@ -178,38 +247,42 @@ async def test_web_search_workflow():
                 has_fresh_ideas, has_campaign_integration, is_comprehensive
             ])
             
-            print(f'📈 WEB SEARCH INTEGRATION SCORE: {web_search_score}/6')
+            out.p(f'📈 WEB SEARCH INTEGRATION SCORE: {web_search_score}/6')
             
             if web_search_score >= 5:
-                print('🎉 EXCELLENT: Web search integration working perfectly!')
-                print('   🌐 Multiple searches performed automatically')
-                print('   📊 Market insights seamlessly integrated')
-                print('   💡 Fresh, data-driven ideas generated')
+                out.p('🎉 EXCELLENT: Web search integration working perfectly!')
+                out.p('   🌐 Multiple searches performed automatically')
+                out.p('   📊 Market insights seamlessly integrated')
+                out.p('   💡 Fresh, data-driven ideas generated')
             elif web_search_score >= 3:
-                print('✅ GOOD: Web search integration functional with room for improvement')
+                out.p('✅ GOOD: Web search integration functional with room for improvement')
             else:
-                print('⚠️  NEEDS IMPROVEMENT: Web search integration not fully working')
-            
-            print()
-            print('🌐 WEB SEARCH WORKFLOW TEST COMPLETED!')
-            print('=' * 55)
-            print('✅ Campaign brainstorming scenario tested')
-            print(f'✅ Execution time: {execution_time:.1f} seconds')
-            print(f'✅ Web searches performed: {len(web_searches)}')
-            print(f'✅ Total tools used: {len(result.get("tool_calls", []))}')
-            print(f'✅ Integration score: {web_search_score}/6')
-            print()
+                out.p('⚠️  NEEDS IMPROVEMENT: Web search integration not fully working')
+            
+            out.p()
+            out.p('🌐 WEB SEARCH WORKFLOW TEST COMPLETED!')
+            out.p('=' * 55)
+            out.p('✅ Campaign brainstorming scenario tested')
+            out.p(f'✅ Execution time: {execution_time:.1f} seconds')
+            out.p(f'✅ Web searches performed: {len(web_searches)}')
+            out.p(f'✅ Total tools used: {len(tool_calls)}')
+            out.p(f'✅ Integration score: {web_search_score}/6')
+            out.p()
             
             return web_search_score >= 3
         else:
-            print(f'❌ Web Search Workflow Failed: {result.get("errors", [])}')
+            out.p(f'❌ Web Search Workflow Failed: {result.get("errors", [])}')
             return False
             
     except Exception as e:
-        print(f'❌ Test failed with exception: {str(e)}')
-        import traceback
-        traceback.print_exc()
+        out.p(f'❌ Test failed with exception: {str(e)}')
+        out.flush()
+        if os.getenv("CAMPAIGNAI_TRACEBACK", "1") == "1":
+            import traceback
+            traceback.print_exc()
         return False
+    finally:
+        out.flush()
 
 async def main():
     """Main test function."""
@@ -227,7 +300,7 @@ async def main():
         print('   ✅ Campaign data combined with external research')
         print()
         print('📁 FILES GENERATED:')
-        print('   🖼️  web_search_workflow_graph.png - Workflow diagram')
+        print('   🖼️  web_search_workflow_graph.<signature>.png - Workflow diagram')
         print('   📊 Web search integration validated')
     else:
         print('\n❌ WEB SEARCH INTEGRATION TEST FAILED')
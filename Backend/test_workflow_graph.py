@@ -10,7 +10,8 @@ import os
 import sys
 import asyncio
 import logging
-from datetime import datetime
+import time
+from collections import Counter
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -24,6 +25,16 @@ sys.path.append(backend_dir)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+REQUIRED_VARS = ('OPENAI_API_KEY', 'TAVILY_API_KEY', 'PINECONE_API_KEY')
+
+def banner(*lines: str):
+    """Write a block of lines to stdout in a single call."""
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+def _trunc(s: str, n: int = 500) -> str:
+    """Truncate to n chars with a trailing ellipsis, without measuring the whole string."""
+    return f'{s[:n]}...' if s[n:n + 1] else s
+
 async def test_workflow_graph():
     """Test the LangGraph workflow and generate visualization."""
     print('🧪 Testing Campaign Optimization LangGraph Workflow')
@@ -61,7 +72,7 @@ async def test_workflow_graph():
             "platforms": ["facebook", "instagram"]
         }
         
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
         
         # Run the workflow
         result = await workflow_graph.run_workflow(
@@ -69,19 +80,20 @@ async def test_workflow_graph():
             campaign_context=test_context
         )
         
-        end_time = datetime.now()
-        execution_time = (end_time - start_time).total_seconds()
+        execution_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         # Display results
-        print('\n📋 WORKFLOW EXECUTION RESULTS')
-        print('=' * 40)
-        print(f'Workflow ID: {result["workflow_id"]}')
-        print(f'Status: {result["status"]}')
-        print(f'Current Step: {result["current_step"]}')
-        print(f'Execution Time: {execution_time:.2f} seconds')
-        print(f'Total Tool Calls: {len(result["tool_calls"])}')
-        print(f'Iteration Count: {result["iteration_count"]}')
-        print(f'Errors: {len(result["errors"])}')
+        banner(
+            '\n📋 WORKFLOW EXECUTION RESULTS',
+            '=' * 40,
+            f'Workflow ID: {result["workflow_id"]}',
+            f'Status: {result["status"]}',
+            f'Current Step: {result["current_step"]}',
+            f'Execution Time: {execution_time:.2f} seconds',
+            f'Total Tool Calls: {len(result["tool_calls"])}',
+            f'Iteration Count: {result["iteration_count"]}',
+            f'Errors: {len(result["errors"])}'
+        )
         
         if result["errors"]:
             print('\n❌ ERRORS:')
@@ -96,29 +108,28 @@ async def test_workflow_graph():
             ('Reporting', result.get("reporting_results", {}))
         ]
         
-        for phase_name, phase_result in phases:
-            status = phase_result.get("status", "not_executed")
-            tool_calls = len(phase_result.get("tool_calls", []))
-            print(f'  {phase_name}: {status} ({tool_calls} tool calls)')
+        print('\n'.join(
+            f'  {name}: {phase.get("status", "not_executed")} ({len(phase.get("tool_calls", ()))} tool calls)'
+            for name, phase in phases
+        ))
         
         print(f'\n📝 FINAL OUTPUT:')
         print('-' * 40)
         final_output = result.get("final_output", "No output generated")
-        print(final_output[:500] + "..." if len(final_output) > 500 else final_output)
+        print(_trunc(final_output))
         
         print(f'\n🔧 TOOL CALLS SUMMARY:')
         print('-' * 40)
-        tool_summary = {}
-        for tool_call in result["tool_calls"]:
-            tool_name = tool_call.get("name", "unknown")
-            tool_summary[tool_name] = tool_summary.get(tool_name, 0) + 1
+        tool_summary = Counter(tc.get("name", "unknown") for tc in result["tool_calls"])
         
-        for tool_name, count in tool_summary.items():
+        for tool_name, count in tool_summary.most_common():
             print(f'  {tool_name}: {count} calls')
         
-        print(f'\n✅ WORKFLOW TEST COMPLETED SUCCESSFULLY!')
-        print(f'📊 Graph visualization: {viz_path}')
-        print(f'⏱️  Total execution time: {execution_time:.2f} seconds')
+        banner(
+            f'\n✅ WORKFLOW TEST COMPLETED SUCCESSFULLY!',
+            f'📊 Graph visualization: {viz_path}',
+            f'⏱️  Total execution time: {execution_time:.2f} seconds'
+        )
         
         return True
         
@@ -133,8 +144,8 @@ async def main():
     print('=' * 60)
     
     # Check environment variables
-    required_vars = ['OPENAI_API_KEY', 'TAVILY_API_KEY', 'PINECONE_API_KEY']
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    env = os.environ
+    missing_vars = [var for var in REQUIRED_VARS if not env.get(var)]
     
     if missing_vars:
         print(f'❌ Missing environment variables: {", ".join(missing_vars)}')
@@ -154,4 +165,11 @@ async def main():
     return success
 
 if __name__ == "__main__":
+    # uvloop ships with uvicorn[standard]; fall back to the default loop where it is missing (e.g. Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     asyncio.run(main()) 
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+Persistent LLM response cache for the workflow test scripts.
+
+Opt-in: set CAMPAIGNAI_LLM_CACHE=1 to enable it. Workflow results are keyed on
+a hash of the normalized instruction and context plus a fingerprint of the
+agent sources (app/agents/*.py) and kept on disk for 12 hours, so repeat runs
+skip the LLM and MCP tool calls until the agent code changes.
+"""
+
+import glob
+import hashlib
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict
+
+try:
+    import diskcache
+    HAS_DISKCACHE = True
+except ImportError:
+    HAS_DISKCACHE = False
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BACKEND_DIR, ".llm_cache")
+AGENTS_GLOB = os.path.join(BACKEND_DIR, "app", "agents", "*.py")
+DEFAULT_TTL = 12 * 60 * 60  # 12 hours
+
+_ENABLED = HAS_DISKCACHE and os.getenv("CAMPAIGNAI_LLM_CACHE", "0") == "1"
+cache = diskcache.Cache(CACHE_DIR) if _ENABLED else None
+stats = {"hits": 0, "misses": 0}
+
+_MISSING = object()
+
+def _code_fingerprint() -> str:
+    """sha256 over the agent sources, so any agent change invalidates cached results."""
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(AGENTS_GLOB)):
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+CODE_FINGERPRINT = _code_fingerprint()
+
+def cache_key(key_obj: Any) -> str:
+    """Stable sha256 key for a JSON-serializable object and the current agent code."""
+    payload = json.dumps([CODE_FINGERPRINT, key_obj], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+async def cached_run(fn: Callable[[], Awaitable[Dict[str, Any]]], key_obj: Any, ttl: int = DEFAULT_TTL) -> Dict[str, Any]:
+    """Return the cached result for key_obj, or await fn() and cache it.
+
+    Only completed runs are stored so a transient failure is retried next time.
+    """
+    if cache is None:
+        return await fn()
+
+    k = cache_key(key_obj)
+    result = cache.get(k, default=_MISSING)
+    if result is not _MISSING:
+        stats["hits"] += 1
+        return result
+
+    stats["misses"] += 1
+    result = await fn()
+    if isinstance(result, dict) and result.get("status") == "completed":
+        cache.set(k, result, expire=ttl)
+    return result
+
+def cache_summary() -> str:
+    """One-line hit/miss summary for the end of a test run."""
+    if cache is None:
+        return "🗄️ LLM cache: disabled (set CAMPAIGNAI_LLM_CACHE=1 to enable)"
+    return f"🗄️ LLM cache: {stats['hits']} hits, {stats['misses']} misses ({CACHE_DIR})"
@@ -0,0 +1,101 @@
+"""
+Shared pytest fixtures for the API test suite.
+"""
+
+import asyncio
+import itertools
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.main import app
+from app.core.database import engine, get_async_session
+from app.api.routes.campaigns import get_workflow_graph
+from app.agents.state import WorkflowStatus
+
+# One event loop for the whole session so session-scoped async fixtures stay usable
+@pytest.fixture(scope="session")
+def event_loop():
+    """Session-wide event loop"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest_asyncio.fixture(scope="session")
+async def db_transaction():
+    """
+    Run the whole suite inside one outer transaction that is rolled back at the end.
+    
+    The connection is opened once, before the first test, so that is the only
+    connection handshake the suite pays.
+    
+    Each request gets its own session bound to the shared connection; route-level
+    commits only release a SAVEPOINT, so nothing is ever committed to the database.
+    """
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        # The connection can only run one statement at a time, so requests issued
+        # together (e.g. asyncio.gather in the integration test) are serialized for
+        # the lifetime of their session. Separate connections would not see the
+        # suite's uncommitted data, so DB-backed requests never overlap here.
+        connection_lock = asyncio.Lock()
+        
+        async def _get_test_session():
+            async with connection_lock, AsyncSession(
+                bind=connection,
+                join_transaction_mode="create_savepoint",
+                expire_on_commit=False
+            ) as session:
+                yield session
+        
+        app.dependency_overrides[get_async_session] = _get_test_session
+        try:
+            yield connection
+        finally:
+            app.dependency_overrides.pop(get_async_session, None)
+            await transaction.rollback()
+
+@pytest.fixture(autouse=True)
+def assert_orjson_default_response():
+    """Fail loudly if the app stops using ORJSONResponse by default"""
+    assert app.router.default_response_class is ORJSONResponse
+
+class StubWorkflowGraph:
+    """Stand-in for the LangGraph workflow that returns a pending workflow instantly"""
+    
+    _ids = itertools.count(1)
+    
+    def __init__(self):
+        self.states = {}
+    
+    async def run_workflow(self, campaign_id, trigger_reason, priority):
+        state = {
+            "workflow_id": f"stub-{next(self._ids)}",
+            "campaign_id": campaign_id,
+            "status": WorkflowStatus.PENDING,
+            "current_step": "initialization",
+            "progress": 0.0,
+            "started_at": datetime.utcnow()
+        }
+        self.states[state["workflow_id"]] = state
+        return state
+    
+    async def get_workflow_state(self, workflow_id):
+        return self.states.get(workflow_id)
+
+@pytest.fixture(autouse=True)
+def stub_workflow_graph(request):
+    """Skip real optimization runs unless the test is marked slow"""
+    if request.node.get_closest_marker("slow"):
+        yield None
+        return
+    
+    stub = StubWorkflowGraph()
+    app.dependency_overrides[get_workflow_graph] = lambda: stub
+    try:
+        yield stub
+    finally:
+        app.dependency_overrides.pop(get_workflow_graph, None)
@@ -9,85 +9,150 @@ Basic test suite covering core API functionality:
 """
 
 import pytest
+import pytest_asyncio
 import asyncio
-from httpx import AsyncClient
-from fastapi.testclient import TestClient
+from typing import Any, Dict, List
+
+from httpx import AsyncClient, ASGITransport
+from pydantic import BaseModel, TypeAdapter
 
 from app.main import app
-from app.core.database import get_session
+from app.core.database import get_async_session
 from app.models.campaign import Campaign, PlatformType, CampaignStatus
+from app.api.routes.campaigns import CampaignResponse, CampaignMetricsResponse
+
+class MetricTrendsOut(BaseModel):
+    """Shape of the /analytics/trends/{metric} response asserted by the tests"""
+    metric: str
+    trend_direction: str
+    data_points: List[Dict[str, Any]]
+
+# Keys each response must contain (checked as one subset comparison)
+OVERVIEW_KEYS = frozenset({"performance_metrics", "platform_comparison", "trends", "top_performers"})
+PERFORMANCE_INSIGHTS_KEYS = frozenset({"total_campaigns_analyzed", "key_insights", "performance_segments", "recommendations"})
+PLATFORM_COMPARISON_KEYS = frozenset({"platforms", "analysis_period"})
+DEMOGRAPHIC_KEYS = frozenset({"demographic_performance", "insights", "recommendations"})
+SYSTEM_INFO_KEYS = frozenset({"system", "coordinator", "background_tasks", "database"})
+
+# Response shapes validated straight from the raw bytes (no intermediate json.loads)
+CAMPAIGN_LIST_ADAPTER = TypeAdapter(List[CampaignResponse])
+CAMPAIGN_METRICS_ADAPTER = TypeAdapter(List[CampaignMetricsResponse])
+METRIC_TRENDS_ADAPTER = TypeAdapter(MetricTrendsOut)
+
+@pytest_asyncio.fixture(scope="session")
+async def test_client(db_transaction):
+    """Fixture providing one in-process async client for the whole suite"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
 
-# Test client setup
-client = TestClient(app)
+SHARED_CAMPAIGN_NAME = "Shared Test Campaign"
+
+@pytest_asyncio.fixture(scope="session")
+async def sample_campaign_ids(test_client):
+    """Small pool of campaigns created once and shared by tests that only read them"""
+    campaigns_data = [
+        {
+            "name": f"{SHARED_CAMPAIGN_NAME} {i}",
+            "platform": "facebook",
+            "budget": 1000.0,
+            "start_date": "2024-01-01T00:00:00Z"
+        }
+        for i in range(2)
+    ]
+    response = await test_client.post("/api/v1/campaigns/bulk", json=campaigns_data)
+    assert response.status_code == 200, response.text
+    return [campaign["id"] for campaign in response.json()]
+
+@pytest_asyncio.fixture(scope="session")
+async def sample_campaign_id(sample_campaign_ids):
+    """ID of the first shared campaign"""
+    return sample_campaign_ids[0]
+
+# (platform, budget) cases shared by the parametrized create/update tests
+CAMPAIGN_CASES = [("facebook", 1000.0), ("instagram", 500.0)]
+
+@pytest_asyncio.fixture(params=CAMPAIGN_CASES, ids=lambda case: case[0])
+async def fresh_campaign_id(request, test_client):
+    """A newly created campaign for tests that mutate it, one per platform case"""
+    platform, budget = request.param
+    campaign_data = {
+        "name": "Test Campaign 3",
+        "platform": platform,
+        "budget": budget,
+        "start_date": "2024-01-01T00:00:00Z"
+    }
+    response = await test_client.post("/api/v1/campaigns/", json=campaign_data)
+    return response.json()["id"]
 
 class TestCampaignAPI:
     """Test campaign API endpoints"""
     
-    def test_health_check(self):
+    async def test_health_check(self, test_client):
         """Test health check endpoint"""
-        response = client.get("/health")
+        response = await test_client.get("/health")
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "healthy"
         assert "version" in data
     
-    def test_get_campaigns(self):
+    async def test_get_campaigns(self, test_client):
         """Test getting campaigns list"""
-        response = client.get("/api/v1/campaigns/")
+        response = await test_client.get("/api/v1/campaigns/")
         assert response.status_code == 200
-        data = response.json()
-        assert isinstance(data, list)
+        items = CAMPAIGN_LIST_ADAPTER.validate_json(response.content)
+        assert isinstance(items, list)
     
-    def test_create_campaign(self):
+    @pytest.mark.parametrize("platform,budget", CAMPAIGN_CASES)
+    async def test_create_campaign(self, test_client, platform, budget):
         """Test creating a new campaign"""
         campaign_data = {
             "name": "Test Campaign",
-            "platform": "facebook",
-            "budget": 1000.0,
+            "platform": platform,
+            "budget": budget,
             "start_date": "2024-01-01T00:00:00Z",
             "targeting": {"age": "25-35", "location": "US"},
             "ad_creative": {"title": "Test Ad", "description": "Test Description"}
         }
         
-        response = client.post("/api/v1/campaigns/", json=campaign_data)
+        response = await test_client.post("/api/v1/campaigns/", json=campaign_data)
         assert response.status_code == 200
         data = response.json()
         assert data["name"] == "Test Campaign"
-        assert data["platform"] == "facebook"
-        assert data["budget"] == 1000.0
+        assert data["platform"] == platform
+        assert data["budget"] == budget
     
-    def test_get_campaign_by_id(self):
-        """Test getting a specific campaign"""
-        # First create a campaign
-        campaign_data = {
-            "name": "Test Campaign 2",
-            "platform": "instagram",
-            "budget": 500.0,
-            "start_date": "2024-01-01T00:00:00Z"
-        }
+    async def test_create_campaigns_bulk(self, test_client):
+        """Test creating several campaigns in one request"""
+        campaigns_data = [
+            {
+                "name": f"Bulk Test Campaign {i}",
+                "platform": platform,
+                "budget": budget,
+                "start_date": "2024-01-01T00:00:00Z"
+            }
+            for i, (platform, budget) in enumerate(CAMPAIGN_CASES)
+        ]
         
-        create_response = client.post("/api/v1/campaigns/", json=campaign_data)
-        campaign_id = create_response.json()["id"]
+        response = await test_client.post("/api/v1/campaigns/bulk", json=campaigns_data)
+        assert response.status_code == 200
+        items = CAMPAIGN_LIST_ADAPTER.validate_json(response.content)
+        assert [item.name for item in items] == [c["name"] for c in campaigns_data]
+        assert len({item.id for item in items}) == len(campaigns_data)
+    
+    async def test_get_campaign_by_id(self, test_client, sample_campaign_id):
+        """Test getting a specific campaign"""
+        campaign_id = sample_campaign_id
         
-        # Then get it by ID
-        response = client.get(f"/api/v1/campaigns/{campaign_id}")
+        # Get it by ID
+        response = await test_client.get(f"/api/v1/campaigns/{campaign_id}")
         assert response.status_code == 200
         data = response.json()
         assert data["id"] == campaign_id
-        assert data["name"] == "Test Campaign 2"
+        assert data["name"] == f"{SHARED_CAMPAIGN_NAME} 0"
     
-    def test_update_campaign(self):
+    async def test_update_campaign(self, test_client, fresh_campaign_id):
         """Test updating a campaign"""
-        # First create a campaign
-        campaign_data = {
-            "name": "Test Campaign 3",
-            "platform": "facebook",
-            "budget": 750.0,
-            "start_date": "2024-01-01T00:00:00Z"
-        }
-        
-        create_response = client.post("/api/v1/campaigns/", json=campaign_data)
-        campaign_id = create_response.json()["id"]
+        campaign_id = fresh_campaign_id
         
         # Update the campaign
         update_data = {
@@ -96,46 +161,28 @@ class TestCampaignAPI:
             "status": "paused"
         }
         
-        response = client.put(f"/api/v1/campaigns/{campaign_id}", json=update_data)
+        response = await test_client.put(f"/api/v1/campaigns/{campaign_id}", json=update_data)
         assert response.status_code == 200
         data = response.json()
         assert data["name"] == "Updated Test Campaign"
         assert data["budget"] == 1250.0
     
-    def test_get_campaign_metrics(self):
+    async def test_get_campaign_metrics(self, test_client, sample_campaign_id):
         """Test getting campaign metrics"""
-        # Create a campaign first
-        campaign_data = {
-            "name": "Metrics Test Campaign",
-            "platform": "facebook",
-            "budget": 1000.0,
-            "start_date": "2024-01-01T00:00:00Z"
-        }
-        
-        create_response = client.post("/api/v1/campaigns/", json=campaign_data)
-        campaign_id = create_response.json()["id"]
+        campaign_id = sample_campaign_id
         
         # Get metrics (might be empty for new campaign)
-        response = client.get(f"/api/v1/campaigns/{campaign_id}/metrics")
+        response = await test_client.get(f"/api/v1/campaigns/{campaign_id}/metrics")
         assert response.status_code == 200
-        data = response.json()
-        assert isinstance(data, list)
+        metrics = CAMPAIGN_METRICS_ADAPTER.validate_json(response.content)
+        assert isinstance(metrics, list)
     
-    def test_get_campaign_performance(self):
+    async def test_get_campaign_performance(self, test_client, sample_campaign_id):
         """Test getting campaign performance summary"""
-        # Create a campaign first
-        campaign_data = {
-            "name": "Performance Test Campaign",
-            "platform": "instagram",
-            "budget": 500.0,
-            "start_date": "2024-01-01T00:00:00Z"
-        }
-        
-        create_response = client.post("/api/v1/campaigns/", json=campaign_data)
-        campaign_id = create_response.json()["id"]
+        campaign_id = sample_campaign_id
         
         # Get performance
-        response = client.get(f"/api/v1/campaigns/{campaign_id}/performance")
+        response = await test_client.get(f"/api/v1/campaigns/{campaign_id}/performance")
         assert response.status_code == 200
         data = response.json()
         assert "campaign_id" in data
@@ -144,90 +191,59 @@ class TestCampaignAPI:
 class TestAnalyticsAPI:
     """Test analytics API endpoints"""
     
-    def test_get_analytics_overview(self):
+    async def test_get_analytics_overview(self, test_client):
         """Test analytics overview endpoint"""
-        response = client.get("/api/v1/analytics/overview")
+        response = await test_client.get("/api/v1/analytics/overview")
         assert response.status_code == 200
         data = response.json()
-        assert "performance_metrics" in data
-        assert "platform_comparison" in data
-        assert "trends" in data
-        assert "top_performers" in data
+        assert OVERVIEW_KEYS <= data.keys(), OVERVIEW_KEYS - data.keys()
     
-    def test_get_performance_insights(self):
+    async def test_get_performance_insights(self, test_client):
         """Test performance insights endpoint"""
-        response = client.get("/api/v1/analytics/performance")
+        response = await test_client.get("/api/v1/analytics/performance")
         assert response.status_code == 200
         data = response.json()
-        assert "total_campaigns_analyzed" in data
-        assert "key_insights" in data
-        assert "performance_segments" in data
-        assert "recommendations" in data
+        assert PERFORMANCE_INSIGHTS_KEYS <= data.keys(), PERFORMANCE_INSIGHTS_KEYS - data.keys()
     
-    def test_get_metric_trends(self):
+    async def test_get_metric_trends(self, test_client):
         """Test metric trends endpoint"""
-        response = client.get("/api/v1/analytics/trends/roas")
+        response = await test_client.get("/api/v1/analytics/trends/roas")
         assert response.status_code == 200
-        data = response.json()
-        assert data["metric"] == "roas"
-        assert "trend_direction" in data
-        assert "data_points" in data
+        trends = METRIC_TRENDS_ADAPTER.validate_json(response.content)
+        assert trends.metric == "roas"
     
-    def test_get_platform_comparison(self):
+    async def test_get_platform_comparison(self, test_client):
         """Test platform comparison endpoint"""
-        response = client.get("/api/v1/analytics/comparison")
+        response = await test_client.get("/api/v1/analytics/comparison")
         assert response.status_code == 200
         data = response.json()
-        assert "platforms" in data
-        assert "analysis_period" in data
+        assert PLATFORM_COMPARISON_KEYS <= data.keys(), PLATFORM_COMPARISON_KEYS - data.keys()
     
-    def test_get_demographic_insights(self):
+    async def test_get_demographic_insights(self, test_client):
         """Test demographic insights endpoint"""
-        response = client.get("/api/v1/analytics/demographics")
+        response = await test_client.get("/api/v1/analytics/demographics")
         assert response.status_code == 200
         data = response.json()
-        assert "demographic_performance" in data
-        assert "insights" in data
-        assert "recommendations" in data
+        assert DEMOGRAPHIC_KEYS <= data.keys(), DEMOGRAPHIC_KEYS - data.keys()
 
 class TestOptimizationAPI:
     """Test optimization workflow endpoints"""
     
-    def test_optimize_campaign(self):
+    async def test_optimize_campaign(self, test_client, sample_campaign_id):
         """Test campaign optimization endpoint"""
-        # Create a campaign first
-        campaign_data = {
-            "name": "Optimization Test Campaign",
-            "platform": "facebook",
-            "budget": 1000.0,
-            "start_date": "2024-01-01T00:00:00Z"
-        }
-        
-        create_response = client.post("/api/v1/campaigns/", json=campaign_data)
-        campaign_id = create_response.json()["id"]
+        campaign_id = sample_campaign_id
         
         # Start optimization
-        response = client.post(f"/api/v1/campaigns/{campaign_id}/optimize")
+        response = await test_client.post(f"/api/v1/campaigns/{campaign_id}/optimize")
         assert response.status_code == 200
         data = response.json()
         assert "workflow_id" in data
         assert data["campaign_id"] == campaign_id
         assert "status" in data
     
-    def test_batch_optimization(self):
+    async def test_batch_optimization(self, test_client, sample_campaign_ids):
         """Test batch campaign optimization"""
-        # Create multiple campaigns
-        campaign_ids = []
-        for i in range(2):
-            campaign_data = {
-                "name": f"Batch Test Campaign {i}",
-                "platform": "facebook",
-                "budget": 500.0,
-                "start_date": "2024-01-01T00:00:00Z"
-            }
-            
-            create_response = client.post("/api/v1/campaigns/", json=campaign_data)
-            campaign_ids.append(create_response.json()["id"])
+        campaign_ids = sample_campaign_ids
         
         # Run batch optimization
         optimization_data = {
@@ -236,7 +252,7 @@ class TestOptimizationAPI:
             "priority": "medium"
         }
         
-        response = client.post("/api/v1/campaigns/optimize/batch", json=optimization_data)
+        response = await test_client.post("/api/v1/campaigns/optimize/batch", json=optimization_data)
         assert response.status_code == 200
         data = response.json()
         assert isinstance(data, list)
@@ -245,53 +261,35 @@ class TestOptimizationAPI:
 class TestBackgroundTasksAPI:
     """Test background task endpoints"""
     
-    def test_trigger_optimization_task(self):
+    async def test_trigger_optimization_task(self, test_client, sample_campaign_id):
         """Test triggering optimization task"""
-        # Create a campaign first
-        campaign_data = {
-            "name": "Task Test Campaign",
-            "platform": "instagram",
-            "budget": 750.0,
-            "start_date": "2024-01-01T00:00:00Z"
-        }
-        
-        create_response = client.post("/api/v1/campaigns/", json=campaign_data)
-        campaign_id = create_response.json()["id"]
+        campaign_id = sample_campaign_id
         
         # Trigger optimization task
-        response = client.post(f"/api/v1/tasks/optimize/{campaign_id}?priority=high")
+        response = await test_client.post(f"/api/v1/tasks/optimize/{campaign_id}?priority=high")
         assert response.status_code == 200
         data = response.json()
         assert "task_id" in data
         assert data["campaign_id"] == campaign_id
         assert data["priority"] == "high"
     
-    def test_trigger_metrics_simulation(self):
+    async def test_trigger_metrics_simulation(self, test_client):
         """Test triggering metrics simulation"""
-        response = client.post("/api/v1/tasks/simulate-metrics")
+        response = await test_client.post("/api/v1/tasks/simulate-metrics")
         assert response.status_code == 200
         data = response.json()
         assert "task_id" in data
         assert data["task_type"] == "metric_simulation"
     
-    def test_get_task_status(self):
+    async def test_get_task_status(self, test_client, sample_campaign_id):
         """Test getting task status"""
-        # First trigger a task
-        campaign_data = {
-            "name": "Task Status Campaign",
-            "platform": "facebook",
-            "budget": 600.0,
-            "start_date": "2024-01-01T00:00:00Z"
-        }
-        
-        create_response = client.post("/api/v1/campaigns/", json=campaign_data)
-        campaign_id = create_response.json()["id"]
+        campaign_id = sample_campaign_id
         
-        task_response = client.post(f"/api/v1/tasks/optimize/{campaign_id}")
+        task_response = await test_client.post(f"/api/v1/tasks/optimize/{campaign_id}")
         task_id = task_response.json()["task_id"]
         
         # Get task status
-        response = client.get(f"/api/v1/tasks/{task_id}")
+        response = await test_client.get(f"/api/v1/tasks/{task_id}")
         assert response.status_code == 200
         data = response.json()
         assert "task_id" in data
@@ -300,20 +298,17 @@ class TestBackgroundTasksAPI:
 class TestSystemAPI:
     """Test system information endpoints"""
     
-    def test_system_info(self):
+    async def test_system_info(self, test_client):
         """Test system info endpoint"""
-        response = client.get("/api/v1/system/info")
+        response = await test_client.get("/api/v1/system/info")
         assert response.status_code == 200
         data = response.json()
-        assert "system" in data
-        assert "coordinator" in data
-        assert "background_tasks" in data
-        assert "database" in data
+        assert SYSTEM_INFO_KEYS <= data.keys(), SYSTEM_INFO_KEYS - data.keys()
 
 class TestMCPAPI:
     """Test MCP (Model Context Protocol) endpoints"""
     
-    def test_mcp_initialize(self):
+    async def test_mcp_initialize(self, test_client):
         """Test MCP initialization"""
         request_data = {
             "method": "initialize",
@@ -321,13 +316,13 @@ class TestMCPAPI:
             "id": "test_1"
         }
         
-        response = client.post("/api/v1/mcp", json=request_data)
+        response = await test_client.post("/api/v1/mcp", json=request_data)
         assert response.status_code == 200
         data = response.json()
         assert "result" in data
         assert data["id"] == "test_1"
     
-    def test_mcp_list_tools(self):
+    async def test_mcp_list_tools(self, test_client):
         """Test MCP list tools"""
         request_data = {
             "method": "tools/list",
@@ -335,7 +330,7 @@ class TestMCPAPI:
             "id": "test_2"
         }
         
-        response = client.post("/api/v1/mcp", json=request_data)
+        response = await test_client.post("/api/v1/mcp", json=request_data)
         assert response.status_code == 200
         data = response.json()
         assert "result" in data
@@ -354,57 +349,42 @@ def test_campaign_data():
         "ad_creative": {"title": "Test Ad", "description": "Test Description"}
     }
 
-@pytest.fixture
-async def test_client():
-    """Fixture providing async test client"""
-    async with AsyncClient(app=app, base_url="http://test") as ac:
-        yield ac
-
 # Integration tests
 class TestIntegration:
     """Integration tests covering full workflows"""
     
-    def test_full_optimization_workflow(self):
+    @pytest.mark.slow
+    async def test_full_optimization_workflow(self, test_client, sample_campaign_id):
         """Test complete optimization workflow"""
-        # 1. Create a campaign
-        campaign_data = {
-            "name": "Integration Test Campaign",
-            "platform": "facebook",
-            "budget": 1000.0,
-            "start_date": "2024-01-01T00:00:00Z"
-        }
-        
-        create_response = client.post("/api/v1/campaigns/", json=campaign_data)
-        assert create_response.status_code == 200
-        campaign_id = create_response.json()["id"]
+        campaign_id = sample_campaign_id
         
-        # 2. Start optimization
-        optimize_response = client.post(f"/api/v1/campaigns/{campaign_id}/optimize")
+        # 1. Start optimization on the shared campaign
+        optimize_response = await test_client.post(f"/api/v1/campaigns/{campaign_id}/optimize")
         assert optimize_response.status_code == 200
         workflow_id = optimize_response.json()["workflow_id"]
         
-        # 3. Check workflow status
-        status_response = client.get(f"/api/v1/campaigns/{campaign_id}/workflow/{workflow_id}")
+        # 2. Check workflow status, campaign performance and analytics. They don't
+        # depend on each other, so they're issued together; the DB-backed ones still
+        # run one at a time on the suite's single rollback connection (see conftest)
+        status_response, performance_response, analytics_response = await asyncio.gather(
+            test_client.get(f"/api/v1/campaigns/{campaign_id}/workflow/{workflow_id}"),
+            test_client.get(f"/api/v1/campaigns/{campaign_id}/performance"),
+            test_client.get("/api/v1/analytics/overview")
+        )
         assert status_response.status_code == 200
-        
-        # 4. Get campaign performance
-        performance_response = client.get(f"/api/v1/campaigns/{campaign_id}/performance")
         assert performance_response.status_code == 200
-        
-        # 5. Get analytics
-        analytics_response = client.get("/api/v1/analytics/overview")
         assert analytics_response.status_code == 200
 
 # Error handling tests
 class TestErrorHandling:
     """Test error handling scenarios"""
     
-    def test_campaign_not_found(self):
+    async def test_campaign_not_found(self, test_client):
         """Test 404 for non-existent campaign"""
-        response = client.get("/api/v1/campaigns/nonexistent_id")
+        response = await test_client.get("/api/v1/campaigns/nonexistent_id")
         assert response.status_code == 404
     
-    def test_invalid_campaign_data(self):
+    async def test_invalid_campaign_data(self, test_client):
         """Test validation errors"""
         invalid_data = {
             "name": "",  # Empty name should fail validation
@@ -412,12 +392,12 @@ class TestErrorHandling:
             "budget": -100  # Negative budget should fail
         }
         
-        response = client.post("/api/v1/campaigns/", json=invalid_data)
+        response = await test_client.post("/api/v1/campaigns/", json=invalid_data)
         assert response.status_code == 422  # Unprocessable Entity
     
-    def test_invalid_optimization_priority(self):
+    async def test_invalid_optimization_priority(self, test_client):
         """Test invalid optimization priority"""
-        response = client.post("/api/v1/tasks/optimize/test_id?priority=invalid")
+        response = await test_client.post("/api/v1/tasks/optimize/test_id?priority=invalid")
         assert response.status_code == 400
 
 if __name__ == "__main__":
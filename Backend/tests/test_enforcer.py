@@ -0,0 +1,30 @@
+"""
+Unit tests for the EnforcerAgent loop limits
+"""
+
+from app.agents.validation import EnforcerAgent
+
+class TestEnforcerBatch:
+    """Test batched should_continue decisions"""
+    
+    def test_batch_matches_sequential_calls(self):
+        """A batch makes the same decisions as repeated should_continue calls"""
+        batched = EnforcerAgent(max_iterations=5, max_retries=3)
+        sequential = EnforcerAgent(max_iterations=5, max_retries=3)
+        
+        decisions = batched.should_continue_batch("wf", "probe", 5)
+        expected = [sequential.should_continue("wf", "probe") for _ in range(5)]
+        
+        assert decisions == expected
+        assert [d["should_continue"] for d in decisions] == [True, True, True, False, False]
+        assert batched.get_status("wf") == sequential.get_status("wf")
+    
+    def test_batch_error_returns_one_stop_per_count(self):
+        """On error every requested decision defaults to stop"""
+        enforcer = EnforcerAgent()
+        enforcer.iteration_counts = None  # Force _tick to fail
+        
+        decisions = enforcer.should_continue_batch("wf", "probe", 4)
+        
+        assert len(decisions) == 4
+        assert not any(d["should_continue"] for d in decisions)